@@ -1197,6 +1197,22 @@ document.getElementById('f-min').addEventListener('input', renderMetaTable);
 document.getElementById('f-search').addEventListener('input', renderMetaTable);
 
 /* Render home panel tournament list */
+// El servidor regenera el sitio en segundo plano: esperar a que termine
+// (regen_pending en /api/status) antes de recargar la página.
+async function reloadAfterRegen() {{
+  for (let i = 0; i < 120; i++) {{
+    try {{
+      const res = await fetch('/api/status');
+      const st = await res.json();
+      if (!st.regen_pending) break;
+    }} catch (err) {{
+      break;
+    }}
+    await new Promise(r => setTimeout(r, 250));
+  }}
+  window.location.reload();
+}}
+
 function renderHomeTournaments() {{
   const grid = document.getElementById('t-grid');
   const tids = Object.keys(ALL_TOURNAMENTS);
@@ -1251,7 +1267,7 @@ function renderHomeTournaments() {{
         const res = await fetch(`/api/tournaments/${{tid}}`, {{ method: 'DELETE' }});
         const data = await res.json();
         if (data.ok) {{
-          setTimeout(() => window.location.reload(), 400);
+          reloadAfterRegen();
         }} else {{
           alert('Error: ' + data.error);
         }}
@@ -1314,58 +1330,6 @@ function renderMatrix() {{
   }});
   h += '</tbody>';
   tbl.innerHTML = h;
-
-  // ── Row/Column highlight
-  const rows = tbl.querySelectorAll('tbody tr');
-  const colThs = tbl.querySelectorAll('thead th');
-  tbl.addEventListener('mouseover', e => {{
-    const td = e.target.closest('td');
-    if (!td || td.classList.contains('rh')) return;
-    const tr = td.closest('tr');
-    const ri = tr ? parseInt(tr.dataset.row) : -1;
-    const ci = Array.from(tr.children).indexOf(td);
-    rows.forEach(r => r.classList.remove('row-hl'));
-    colThs.forEach(th => th.classList.remove('col-hl'));
-    if (tr) tr.classList.add('row-hl');
-    if (ci >= 0 && colThs[ci]) colThs[ci].classList.add('col-hl');
-  }});
-  tbl.addEventListener('mouseleave', () => {{
-    rows.forEach(r => r.classList.remove('row-hl'));
-    colThs.forEach(th => th.classList.remove('col-hl'));
-  }});
-
-  // ── Tooltips
-  const tt = document.getElementById('tt');
-  tbl.querySelectorAll('td[data-a1]').forEach(td => {{
-    td.addEventListener('mouseenter', e => {{
-      const w = +td.dataset.w, l = +td.dataset.l, d = +td.dataset.d, t = +td.dataset.t, wr = +td.dataset.wr;
-      const wPct = t > 0 ? (w/t*100) : 0;
-      const lPct = t > 0 ? (l/t*100) : 0;
-      const dPct = t > 0 ? (d/t*100) : 0;
-      tt.innerHTML = `
-        <div class="tt-h">${{td.dataset.a1}}</div>
-        <div class="tt-sub">vs ${{td.dataset.a2}}</div>
-        <div class="tt-wr" style="color:${{wrColor(wr)}}">${{wr}}%</div>
-        <div class="tt-rec">${{w}}W – ${{l}}L – ${{d}}D &nbsp;(${{t}} matches)</div>
-        <div class="tt-bar">
-          <div class="tt-bar-w" style="width:${{wPct}}%"></div>
-          <div class="tt-bar-d" style="width:${{dPct}}%"></div>
-          <div class="tt-bar-l" style="width:${{lPct}}%"></div>
-        </div>`;
-      tt.classList.add('show');
-      positionTooltip(e);
-    }});
-    td.addEventListener('mousemove', positionTooltip);
-    td.addEventListener('mouseleave', () => tt.classList.remove('show'));
-  }});
-
-  // Click cell → detail
-  tbl.querySelectorAll('td[data-a1]').forEach(td => {{
-    td.addEventListener('dblclick', () => {{
-      document.getElementById('dd-select').value = td.dataset.a1;
-      document.querySelector('.nav-btn[data-panel="detail-panel"]').click();
-    }});
-  }});
 }}
 
 function positionTooltip(e) {{
@@ -1379,6 +1343,68 @@ function positionTooltip(e) {{
   tt.style.top = top + 'px';
 }}
 
+// Eventos de la matriz: delegados en la tabla y registrados una sola vez
+// (renderMatrix solo sustituye su contenido, así no se acumulan listeners)
+const mxTbl = document.getElementById('mx-tbl');
+let mxCell = null;  // celda bajo el ratón
+
+function clearMatrixHighlight() {{
+  mxTbl.querySelectorAll('.row-hl').forEach(r => r.classList.remove('row-hl'));
+  mxTbl.querySelectorAll('.col-hl').forEach(th => th.classList.remove('col-hl'));
+}}
+
+function showMatrixTooltip(td, e) {{
+  const tt = document.getElementById('tt');
+  const w = +td.dataset.w, l = +td.dataset.l, d = +td.dataset.d, t = +td.dataset.t, wr = +td.dataset.wr;
+  const wPct = t > 0 ? (w/t*100) : 0;
+  const lPct = t > 0 ? (l/t*100) : 0;
+  const dPct = t > 0 ? (d/t*100) : 0;
+  tt.innerHTML = `
+    <div class="tt-h">${{td.dataset.a1}}</div>
+    <div class="tt-sub">vs ${{td.dataset.a2}}</div>
+    <div class="tt-wr" style="color:${{wrColor(wr)}}">${{wr}}%</div>
+    <div class="tt-rec">${{w}}W – ${{l}}L – ${{d}}D &nbsp;(${{t}} matches)</div>
+    <div class="tt-bar">
+      <div class="tt-bar-w" style="width:${{wPct}}%"></div>
+      <div class="tt-bar-d" style="width:${{dPct}}%"></div>
+      <div class="tt-bar-l" style="width:${{lPct}}%"></div>
+    </div>`;
+  tt.classList.add('show');
+  positionTooltip(e);
+}}
+
+// ── Row/Column highlight + tooltips
+mxTbl.addEventListener('mouseover', e => {{
+  const td = e.target.closest('td');
+  if (td === mxCell) return;
+  mxCell = td;
+  clearMatrixHighlight();
+  if (td && td.dataset.a1) showMatrixTooltip(td, e);
+  else document.getElementById('tt').classList.remove('show');
+  if (!td || td.classList.contains('rh')) return;
+  const tr = td.closest('tr');
+  const ci = Array.from(tr.children).indexOf(td);
+  const colThs = mxTbl.querySelectorAll('thead th');
+  tr.classList.add('row-hl');
+  if (ci >= 0 && colThs[ci]) colThs[ci].classList.add('col-hl');
+}});
+mxTbl.addEventListener('mousemove', e => {{
+  if (mxCell && mxCell.dataset.a1) positionTooltip(e);
+}});
+mxTbl.addEventListener('mouseleave', () => {{
+  mxCell = null;
+  clearMatrixHighlight();
+  document.getElementById('tt').classList.remove('show');
+}});
+
+// Click cell → detail
+mxTbl.addEventListener('dblclick', e => {{
+  const td = e.target.closest('td[data-a1]');
+  if (!td) return;
+  document.getElementById('dd-select').value = td.dataset.a1;
+  document.querySelector('.nav-btn[data-panel="detail-panel"]').click();
+}});
+
 document.getElementById('mx-min').addEventListener('input', renderMatrix);
 document.getElementById('mx-top').addEventListener('input', renderMatrix);
 document.getElementById('mx-search').addEventListener('input', renderMatrix);
@@ -1863,7 +1889,7 @@ document.getElementById('btn-do-add').addEventListener('click', async () => {{
       }} else {{
         showStatus(`🎉 ¡Añadido! <strong>${{data.name}}</strong> — ${{data.total_matches}} partidas, ${{data.total_players || '?'}} jugadores. Recargando...`, 'success');
       }}
-      setTimeout(() => window.location.reload(), 1500);
+      setTimeout(reloadAfterRegen, 1500);
       return;
     }} else {{
       document.querySelectorAll('.progress-step.active').forEach(s => s.className = 'progress-step error');
@@ -69,11 +69,19 @@ class TournamentDB:
 
     def __init__(self, db_path: str = DB_FILE):
         self.db_path = db_path
+        self.mtime = None  # mtime (ns) del archivo la última vez que se leyó/escribió
         self.data = self._load()
 
+    def _file_mtime(self):
+        try:
+            return os.stat(self.db_path).st_mtime_ns
+        except OSError:
+            return None
+
     def _load(self) -> dict:
         """Carga la DB desde disco, o crea una vacía."""
-        if os.path.exists(self.db_path):
+        self.mtime = self._file_mtime()
+        if self.mtime is not None:
             with open(self.db_path, "r", encoding="utf-8") as f:
                 return json.load(f)
         return {"tournaments": {}}
@@ -82,6 +90,18 @@ class TournamentDB:
         """Guarda la DB a disco."""
         with open(self.db_path, "w", encoding="utf-8") as f:
             json.dump(self.data, f, ensure_ascii=False, indent=2)
+        self.mtime = self._file_mtime()
+
+    def reload(self) -> bool:
+        """
+        Vuelve a leer la DB solo si el archivo cambió en disco desde la
+        última lectura/escritura (p. ej. por manage_tournaments.py en otro
+        proceso). Retorna True si se recargó.
+        """
+        if self._file_mtime() == self.mtime:
+            return False
+        self.data = self._load()
+        return True
 
     @property
     def tournaments(self) -> dict:
@@ -96,7 +116,8 @@ class TournamentDB:
     def list_tournaments(self) -> list[dict]:
         """Retorna lista de resúmenes de torneos almacenados."""
         result = []
-        for tid, tdata in self.tournaments.items():
+        # Copia de los items: otro thread puede estar añadiendo un torneo
+        for tid, tdata in list(self.tournaments.items()):
             info = tdata.get("tournament", {})
             result.append({
                 "id": tid,
@@ -131,6 +152,16 @@ class TournamentDB:
             print(f"    Usa force=True para re-scrapear.")
             return self.tournaments[tournament_id]
 
+        tournament_data = self.scrape_tournament_data(tournament_id)
+        self.insert_tournament(tournament_id, tournament_data)
+        return tournament_data
+
+    def scrape_tournament_data(self, tournament_id: str) -> dict:
+        """
+        Scrapea un torneo (matches y decklists) y retorna sus datos en el
+        formato de la DB. No modifica la DB: es la parte lenta (1-2 minutos
+        de red) de add_tournament, y el servidor la ejecuta sin DB_LOCK.
+        """
         # Scrapear el torneo
         print(f"[*] Scrapeando torneo {tournament_id}...")
         tournament = scraper.scrape_tournament(tournament_id)
@@ -179,7 +210,6 @@ class TournamentDB:
                         "format": raw.get("FormatName", ""),
                         "cards": cards,
                     }
-                time.sleep(0.2)
             print(f"[*] Decklists descargadas: {len(decklists_data)}/{total_dl}")
 
         # Construir datos para guardar (mismo formato que tournament_data.json)
@@ -202,7 +232,10 @@ class TournamentDB:
             "decklists": decklists_data,
             "scraped_at": time.strftime("%Y-%m-%d %H:%M:%S UTC", time.gmtime()),
         }
+        return tournament_data
 
+    def insert_tournament(self, tournament_id: str, tournament_data: dict):
+        """Guarda en la DB un torneo ya scrapeado (ver scrape_tournament_data)."""
         # Guardar en la DB
         self.data["tournaments"][tournament_id] = tournament_data
         self._save()
@@ -215,8 +248,6 @@ class TournamentDB:
         print(f"    Matches: {info['total_matches']}")
         print(f"    Jugadores: {info['total_players']}")
 
-        return tournament_data
-
     def remove_tournament(self, url_or_id: str) -> bool:
         """Elimina un torneo de la DB."""
         tournament_id = extract_tournament_id(url_or_id)
@@ -14,14 +14,18 @@ Uso:
 
 import argparse
 import csv
+import http.client
 import json
+import os
 import re
 import ssl
 import sys
+import threading
 import time
+import urllib.error
 import urllib.parse
-import urllib.request
-from collections import defaultdict
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Optional
 
@@ -35,7 +39,19 @@ USER_AGENT = (
     "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
     "(KHTML, like Gecko) Chrome/122.0 Safari/537.36"
 )
-REQUEST_DELAY = 0.5  # segundos entre requests para no saturar el servidor
+REQUEST_DELAY = 0.5  # intervalo inicial entre requests (luego se adapta)
+MIN_REQUEST_DELAY = 0.2  # intervalo mínimo: nunca más rápido, para no saturar melee.gg
+MAX_ATTEMPTS = 4  # intentos por petición si el servidor responde 429/503
+THROTTLE_STATUSES = (429, 503)
+REDIRECT_STATUSES = (301, 302, 303, 307, 308)
+MAX_REDIRECTS = 5  # redirecciones seguidas antes de dar la petición por fallida
+
+# Patrones de extracción del HTML (compilados una sola vez)
+_RE_ROUND_BUTTON = re.compile(r'data-id="(\d+)"\s+data-name="([^"]+)"')
+_RE_ROUND_BUTTON_STARTED = re.compile(
+    r'data-id="(\d+)"\s+data-name="([^"]+)"\s+data-is-started="True"'
+)
+_RE_TITLE = re.compile(r"<title>([^<]+)</title>", re.I)
 
 
 # ---------------------------------------------------------------------------
@@ -84,14 +100,166 @@ def _ssl_context():
     return ssl.create_default_context()
 
 
+class AdaptiveLimiter:
+    """
+    Espaciado adaptativo entre peticiones, compartido por todos los hilos.
+
+    Cada respuesta normal reduce el intervalo un 5% (sin bajar de min_delay,
+    por defecto MIN_REQUEST_DELAY); un 429/503 lo duplica y le suma el
+    Retry-After (hasta max_delay). Así la velocidad sube sola mientras
+    melee.gg lo tolera y baja cuando se queja.
+    """
+
+    def __init__(self, initial: float = REQUEST_DELAY, min_delay: float = MIN_REQUEST_DELAY, max_delay: float = 30.0):
+        self.delay = initial
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.requests = 0
+        self.throttled = 0
+        self.attempts = Counter()  # {nº de intentos: peticiones}
+        self._lock = threading.Lock()
+        self._next_at = 0.0
+        self._started = None
+
+    def wait(self):
+        """Bloquea hasta que toque el siguiente hueco libre."""
+        with self._lock:
+            now = time.monotonic()
+            if self._started is None:
+                self._started = now
+            slot = max(now, self._next_at)
+            self._next_at = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record(self, status: int, retry_after: float = 0.0):
+        """Ajusta el intervalo según el status de la respuesta."""
+        with self._lock:
+            self.requests += 1
+            if status in THROTTLE_STATUSES:
+                self.throttled += 1
+                self.delay = min(self.max_delay, self.delay * 2 + retry_after)
+                # Nadie vuelve a pedir hasta que pase el nuevo intervalo
+                self._next_at = max(self._next_at, time.monotonic() + self.delay)
+            else:
+                self.delay = max(self.min_delay, self.delay * 0.95)
+
+    def record_attempts(self, attempts: int):
+        with self._lock:
+            self.attempts[attempts] += 1
+
+    def stats(self) -> dict:
+        """Resumen para --profile: peticiones, throttling y tasa efectiva."""
+        with self._lock:
+            elapsed = time.monotonic() - self._started if self._started else 0.0
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "attempts": dict(sorted(self.attempts.items())),
+                "delay": self.delay,
+                "elapsed": elapsed,
+                "rate": self.requests / elapsed if elapsed > 0 else 0.0,
+            }
+
+
+RATE_LIMITER = AdaptiveLimiter()
+
+
+def _retry_after(resp: http.client.HTTPResponse) -> float:
+    """Segundos del header Retry-After (solo formato numérico; si no, 0)."""
+    try:
+        return max(0.0, float(resp.getheader("Retry-After", 0)))
+    except ValueError:
+        return 0.0
+
+
+# Una conexión HTTPS persistente (keep-alive) por hilo: todas las peticiones
+# van al mismo host, así que se evita repetir el handshake TCP+TLS.
+_thread_local = threading.local()
+_HOST = urllib.parse.urlsplit(BASE_URL).netloc
+
+
+def _connection(ctx: ssl.SSLContext) -> http.client.HTTPSConnection:
+    """Devuelve la conexión persistente del hilo actual, creándola si hace falta."""
+    conn = getattr(_thread_local, "conn", None)
+    if conn is None:
+        conn = http.client.HTTPSConnection(_HOST, context=ctx, timeout=30)
+        _thread_local.conn = conn
+    return conn
+
+
+def _request(
+    method: str,
+    url: str,
+    ctx: ssl.SSLContext,
+    headers: dict,
+    body: Optional[bytes] = None,
+) -> bytes:
+    """
+    Petición sobre la conexión persistente, espaciada por RATE_LIMITER.
+    Ante un error de red (conexión cerrada entre peticiones, timeout, TLS...)
+    descarta la conexión, reconecta y reintenta una vez; si responde
+    429/503, reintenta hasta MAX_ATTEMPTS veces.
+    Sigue las redirecciones (301/302/303/307/308) dentro del mismo host, hasta
+    MAX_REDIRECTS; como urlopen, un POST redirigido con 301/302/303 pasa a GET
+    sin cuerpo, y 307/308 conservan método y cuerpo.
+    Lanza urllib.error.HTTPError si la respuesta final no es 2xx o si la
+    redirección apunta a otro host (la conexión persistente es solo de BASE_URL).
+    """
+    parts = urllib.parse.urlsplit(url)
+    if parts.netloc != _HOST:
+        raise ValueError(f"URL fuera de {_HOST}: {url}")
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    attempts = 0
+    redirects = 0
+    reconnected = False
+    while True:
+        attempts += 1
+        RATE_LIMITER.wait()
+        conn = _connection(ctx)
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+        except (http.client.HTTPException, OSError):
+            # Conexión cerrada por el servidor, timeout, error TLS/DNS...: la
+            # conexión queda a medio usar, así que se descarta siempre
+            conn.close()
+            _thread_local.conn = None
+            if reconnected:
+                RATE_LIMITER.record_attempts(attempts)
+                raise
+            reconnected = True
+            continue
+        RATE_LIMITER.record(resp.status, _retry_after(resp))
+        if resp.status in THROTTLE_STATUSES and attempts < MAX_ATTEMPTS:
+            continue
+        location = resp.getheader("Location")
+        if resp.status in REDIRECT_STATUSES and location and redirects < MAX_REDIRECTS:
+            target = urllib.parse.urlsplit(urllib.parse.urljoin(url, location))
+            if target.scheme == "https" and target.netloc == _HOST:
+                # Cada destino tiene sus propios reintentos por throttling
+                redirects += 1
+                attempts = 0
+                url = target.geturl()
+                path = target.path + (f"?{target.query}" if target.query else "")
+                if resp.status in (301, 302, 303) and method == "POST":
+                    method, body = "GET", None
+                    headers = {k: v for k, v in headers.items() if k.lower() != "content-type"}
+                continue
+        RATE_LIMITER.record_attempts(attempts)
+        if resp.status >= 300:
+            raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, None)
+        return data
+
+
 def _get(url: str, ctx: ssl.SSLContext, accept: str = "text/html") -> str:
-    """GET request sencillo."""
-    req = urllib.request.Request(url, headers={
+    """GET sobre la conexión persistente (espaciado por RATE_LIMITER)."""
+    data = _request("GET", url, ctx, headers={
         "User-Agent": USER_AGENT,
         "Accept": accept,
     })
-    with urllib.request.urlopen(req, context=ctx, timeout=30) as resp:
-        return resp.read().decode("utf-8", errors="replace")
+    return data.decode("utf-8", errors="replace")
 
 
 def _post_datatables(
@@ -131,17 +299,16 @@ def _post_datatables(
         params[f"columns[{i}][search][regex]"] = "false"
 
     body = urllib.parse.urlencode(params).encode("utf-8")
-    req = urllib.request.Request(url, data=body, headers={
+    data = _request("POST", url, ctx, headers={
         "User-Agent": USER_AGENT,
         "Accept": "application/json, text/plain, */*",
         "Content-Type": "application/x-www-form-urlencoded; charset=UTF-8",
         "X-Requested-With": "XMLHttpRequest",
         "Referer": referer,
         "Origin": BASE_URL,
-    })
-    with urllib.request.urlopen(req, context=ctx, timeout=30) as resp:
-        text = resp.read().decode("utf-8", errors="replace")
-    return json.loads(text)
+    }, body=body)
+    # json.loads acepta bytes UTF-8 directamente: sin decode intermedio
+    return json.loads(data)
 
 
 # ---------------------------------------------------------------------------
@@ -163,22 +330,19 @@ def extract_round_ids(html: str) -> list[tuple[str, str]]:
     pairings_idx = html.find("pairings-round-selector-container")
     if pairings_idx < 0:
         # Fallback: buscar en todo el HTML
-        pattern = r'data-id="(\d+)"\s+data-name="([^"]+)"\s+data-is-started="True"'
-        return re.findall(pattern, html)
+        return _RE_ROUND_BUTTON_STARTED.findall(html)
 
     # Extraer solo la sección de pairings (evitar duplicados con standings)
     section_end = html.find("</div>", pairings_idx + 500)
     if section_end < 0:
         section_end = pairings_idx + 5000
-    section = html[pairings_idx:section_end + 200]
-
-    pattern = r'data-id="(\d+)"\s+data-name="([^"]+)"'
-    return re.findall(pattern, section)
+    # findall con pos/endpos evita copiar la sección a un string nuevo
+    return _RE_ROUND_BUTTON.findall(html, pairings_idx, section_end + 200)
 
 
 def extract_tournament_name(html: str) -> str:
     """Extrae el nombre del torneo del <title>."""
-    m = re.search(r"<title>([^<]+)</title>", html, re.I)
+    m = _RE_TITLE.search(html)
     if m:
         name = m.group(1).replace(" | Melee", "").strip()
         return name
@@ -193,6 +357,15 @@ def fetch_round_matches(
     """
     Descarga TODOS los matches de una ronda usando paginación DataTables.
     """
+    return _fetch_round_matches(round_id, tournament_id, ctx)[0]
+
+
+def _fetch_round_matches(
+    round_id: str,
+    tournament_id: str,
+    ctx: ssl.SSLContext,
+) -> tuple[list[dict], int]:
+    """fetch_round_matches que además retorna el recordsTotal anunciado."""
     url = f"{BASE_URL}/Match/GetRoundMatches/{round_id}"
     referer = f"{BASE_URL}/Tournament/View/{tournament_id}"
     all_matches = []
@@ -208,9 +381,8 @@ def fetch_round_matches(
         if len(all_matches) >= total or not records:
             break
         start += page_size
-        time.sleep(REQUEST_DELAY)
 
-    return all_matches
+    return all_matches, total
 
 
 def parse_player_from_competitor(comp: dict) -> Optional[Player]:
@@ -228,43 +400,53 @@ def parse_player_from_competitor(comp: dict) -> Optional[Player]:
     )
 
 
+def _competitor_decklist(comp: dict) -> tuple[Optional[str], Optional[str]]:
+    """Extrae (DecklistName, DecklistId) de la primera decklist de un Competitor."""
+    decklists = comp.get("Decklists")
+    if not decklists:
+        return None, None
+    return decklists[0].get("DecklistName"), decklists[0].get("DecklistId")
+
+
 def parse_match(match_json: dict, round_number: int, round_id: int) -> MatchResult:
     """Convierte un objeto match del JSON en un MatchResult."""
-    competitors = match_json.get("Competitors", [])
-    is_bye = match_json.get("ByeReason") is not None or len(competitors) < 2
-
-    player1 = parse_player_from_competitor(competitors[0]) if competitors else None
-    player2 = parse_player_from_competitor(competitors[1]) if len(competitors) > 1 else None
-
-    # Extraer wins
-    p1_wins = 0
-    p2_wins = 0
-    if competitors:
-        p1_wins = competitors[0].get("GameWinsAndGameByes", 0) or 0
-    if len(competitors) > 1:
-        p2_wins = competitors[1].get("GameWinsAndGameByes", 0) or 0
-
-    # Decklists
-    p1_deck = None
-    p2_deck = None
-    p1_deck_id = None
-    p2_deck_id = None
-    if competitors and competitors[0].get("Decklists"):
-        p1_deck = competitors[0]["Decklists"][0].get("DecklistName")
-        p1_deck_id = competitors[0]["Decklists"][0].get("DecklistId")
-    if len(competitors) > 1 and competitors[1].get("Decklists"):
-        p2_deck = competitors[1]["Decklists"][0].get("DecklistName")
-        p2_deck_id = competitors[1]["Decklists"][0].get("DecklistId")
+    competitors = match_json.get("Competitors") or ()
+    c1 = competitors[0] if competitors else None
+
+    player1 = parse_player_from_competitor(c1) if c1 else None
+    p1_wins = (c1.get("GameWinsAndGameByes", 0) or 0) if c1 else 0
+    p1_deck, p1_deck_id = _competitor_decklist(c1) if c1 else (None, None)
+
+    # Byes: no hay rival, así que no se parsea el segundo Competitor
+    if match_json.get("ByeReason") is not None or len(competitors) < 2:
+        return MatchResult(
+            round_number=round_number,
+            round_id=round_id,
+            player1=player1,
+            player2=None,
+            player1_wins=p1_wins,
+            player2_wins=0,
+            draws=match_json.get("GameDraws", 0),
+            is_bye=True,
+            bye_reason=match_json.get("ByeReasonDescription"),
+            result_string=match_json.get("ResultString", ""),
+            player1_decklist=p1_deck,
+            player1_decklist_id=p1_deck_id,
+            format_name=match_json.get("Format"),
+        )
+
+    c2 = competitors[1]
+    p2_deck, p2_deck_id = _competitor_decklist(c2)
 
     return MatchResult(
         round_number=round_number,
         round_id=round_id,
         player1=player1,
-        player2=player2,
+        player2=parse_player_from_competitor(c2),
         player1_wins=p1_wins,
-        player2_wins=p2_wins,
+        player2_wins=c2.get("GameWinsAndGameByes", 0) or 0,
         draws=match_json.get("GameDraws", 0),
-        is_bye=is_bye,
+        is_bye=False,
         bye_reason=match_json.get("ByeReasonDescription"),
         result_string=match_json.get("ResultString", ""),
         player1_decklist=p1_deck,
@@ -275,12 +457,84 @@ def parse_match(match_json: dict, round_number: int, round_id: int) -> MatchResu
     )
 
 
+# ---------------------------------------------------------------------------
+# Caché en disco de respuestas raw
+# ---------------------------------------------------------------------------
+# Las rondas terminadas no cambian, así que se guardan en cache_dir y las
+# re-ejecuciones no tocan la red. Una ronda en juego o a medio descargar no
+# se cachea (ver _round_complete) y se vuelve a pedir en la siguiente.
+# cache_dir=None desactiva la caché; refresh=True ignora lo cacheado y lo
+# vuelve a descargar (sobrescribiéndolo).
+def _cache_load(cache_dir: Optional[str], key: str):
+    """Lee `key` de la caché; None si no existe o la caché está desactivada."""
+    if cache_dir is None:
+        return None
+    path = os.path.join(cache_dir, f"{key}.json")
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _cache_store(cache_dir: Optional[str], key: str, data):
+    """
+    Guarda `data` en la caché con escritura atómica (tmp + os.replace).
+    No guarda respuestas vacías: una ronda sin matches suele ser un fallo
+    transitorio o una ronda aún sin publicar, y debe volver a pedirse.
+    """
+    if cache_dir is None or not data:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f"{key}.json")
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def _round_complete(raw_matches: list, total: int) -> bool:
+    """True si la ronda llegó entera y todos sus matches tienen resultado."""
+    if len(raw_matches) < total:
+        return False
+    return all(
+        m.get("HasResult", bool(m.get("ResultString"))) for m in raw_matches
+    )
+
+
+def fetch_round_matches_cached(
+    round_id: str,
+    tournament_id: str,
+    ctx: ssl.SSLContext,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+) -> tuple[list, bool]:
+    """
+    fetch_round_matches con caché en disco (solo se cachean rondas completas).
+    Retorna (raw_matches, from_cache).
+    """
+    key = f"round_{round_id}"
+    raw_matches = None if refresh else _cache_load(cache_dir, key)
+    if raw_matches is not None:
+        return raw_matches, True
+    raw_matches, total = _fetch_round_matches(round_id, tournament_id, ctx)
+    if _round_complete(raw_matches, total):
+        _cache_store(cache_dir, key, raw_matches)
+    return raw_matches, False
+
+
 # ---------------------------------------------------------------------------
 # Scraper principal
 # ---------------------------------------------------------------------------
-def scrape_tournament(tournament_id: str) -> TournamentData:
+def scrape_tournament(
+    tournament_id: str,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+) -> TournamentData:
     """
     Scraper completo: descarga página, extrae rondas, y obtiene todos los matches.
+    Con `cache_dir`, las rondas ya descargadas se leen de disco (ver
+    fetch_round_matches_cached); la página HTML se pide siempre.
     """
     ctx = _ssl_context()
 
@@ -308,7 +562,9 @@ def scrape_tournament(tournament_id: str) -> TournamentData:
         print(f"  [>] {round_name} (id={round_id})...", end=" ", flush=True)
 
         try:
-            raw_matches = fetch_round_matches(round_id, tournament_id, ctx)
+            raw_matches, from_cache = fetch_round_matches_cached(
+                round_id, tournament_id, ctx, cache_dir, refresh,
+            )
             round_number = int(re.search(r"\d+", round_name).group()) if re.search(r"\d+", round_name) else 0
 
             for m in raw_matches:
@@ -321,12 +577,10 @@ def scrape_tournament(tournament_id: str) -> TournamentData:
                 if match.player2:
                     tournament.players[match.player2.id] = match.player2
 
-            print(f"{len(raw_matches)} matches")
+            print(f"{len(raw_matches)} matches" + (" (caché)" if from_cache else ""))
         except Exception as e:
             print(f"ERROR: {e}")
 
-        time.sleep(REQUEST_DELAY)
-
     print(f"\n[*] Total: {len(tournament.matches)} matches, {len(tournament.players)} jugadores")
     return tournament
 
@@ -348,40 +602,47 @@ def build_matchup_matrix(tournament: TournamentData) -> dict:
     player_matches = []
 
     for match in tournament.matches:
-        if match.is_bye or not match.player1 or not match.player2:
+        # Variables locales: evita repetir lookups de atributos en el bucle
+        p1 = match.player1
+        p2 = match.player2
+        if match.is_bye or not p1 or not p2:
             continue
-        if not match.player1_decklist or not match.player2_decklist:
-            continue
-
         d1 = match.player1_decklist
         d2 = match.player2_decklist
+        if not d1 or not d2:
+            continue
+
+        w1 = match.player1_wins
+        w2 = match.player2_wins
+        row1 = deck_matchups[d1][d2]
+        row2 = deck_matchups[d2][d1]
 
         # Determinar ganador
-        if match.player1_wins > match.player2_wins:
-            deck_matchups[d1][d2]["wins"] += 1
-            deck_matchups[d2][d1]["losses"] += 1
-            winner = match.player1.display_name
-        elif match.player2_wins > match.player1_wins:
-            deck_matchups[d1][d2]["losses"] += 1
-            deck_matchups[d2][d1]["wins"] += 1
-            winner = match.player2.display_name
+        if w1 > w2:
+            row1["wins"] += 1
+            row2["losses"] += 1
+            winner = p1.display_name
+        elif w2 > w1:
+            row1["losses"] += 1
+            row2["wins"] += 1
+            winner = p2.display_name
         else:
-            deck_matchups[d1][d2]["draws"] += 1
-            deck_matchups[d2][d1]["draws"] += 1
+            row1["draws"] += 1
+            row2["draws"] += 1
             winner = "Draw"
 
-        deck_matchups[d1][d2]["total"] += 1
-        deck_matchups[d2][d1]["total"] += 1
+        row1["total"] += 1
+        row2["total"] += 1
 
         player_matches.append({
             "round": match.round_number,
-            "player1": match.player1.display_name,
+            "player1": p1.display_name,
             "player1_deck": d1,
-            "player1_wins": match.player1_wins,
+            "player1_wins": w1,
             "player1_decklist_id": match.player1_decklist_id,
-            "player2": match.player2.display_name,
+            "player2": p2.display_name,
             "player2_deck": d2,
-            "player2_wins": match.player2_wins,
+            "player2_wins": w2,
             "player2_decklist_id": match.player2_decklist_id,
             "draws": match.draws,
             "winner": winner,
@@ -400,6 +661,11 @@ def build_matchup_matrix(tournament: TournamentData) -> dict:
     }
 
 
+# Celdas constantes de la matriz impresa (evita formatearlas en cada celda)
+_MIRROR_CELL = f" {'mirror':>13}"
+_EMPTY_CELL = f" {'--':>13}"
+
+
 def print_matchup_matrix(matrix_data: dict):
     """Imprime la matriz de emparejamientos en formato legible."""
     decks = matrix_data["decks"]
@@ -442,31 +708,30 @@ def print_matchup_matrix(matrix_data: dict):
         print(f"MATRIZ DETALLADA (decks con >= {MIN_MATCHES} partidas)")
         print(f"{'='*80}\n")
 
-        header = f"{'VS':<25}"
-        for d2 in popular_decks:
-            short = d2[:12]
-            header += f" {short:>13}"
+        # Cabeceras truncadas calculadas una sola vez
+        header = f"{'VS':<25}" + "".join(f" {d2[:12]:>13}" for d2 in popular_decks)
         print(header)
         print("-" * len(header))
 
         for d1 in popular_decks:
-            row = f"{d1[:24]:<25}"
+            row_parts = [f"{d1[:24]:<25}"]
+            row_stats = matrix.get(d1, {})
             for d2 in popular_decks:
                 if d1 == d2:
-                    row += f" {'mirror':>13}"
+                    row_parts.append(_MIRROR_CELL)
+                    continue
+                stats = row_stats.get(d2)
+                if not stats:
+                    row_parts.append(_EMPTY_CELL)
+                    continue
+                w, l, dr = stats["wins"], stats["losses"], stats["draws"]
+                total = w + l + dr
+                if total > 0:
+                    cell = f"{w}-{l}-{dr} ({w / total * 100:.0f}%)"
+                    row_parts.append(f" {cell:>13}")
                 else:
-                    stats = matrix.get(d1, {}).get(d2, {"wins": 0, "losses": 0, "draws": 0})
-                    w, l, dr = stats["wins"], stats["losses"], stats["draws"]
-                    total = w + l + dr
-                    if total > 0:
-                        wr = w / total * 100
-                        row += f" {w}-{l}-{dr} ({wr:.0f}%)"
-                        # Pad to 13
-                        cell = f"{w}-{l}-{dr} ({wr:.0f}%)"
-                        row = row[:-len(cell)] + f"{cell:>13}"
-                    else:
-                        row += f" {'--':>13}"
-            print(row)
+                    row_parts.append(_EMPTY_CELL)
+            print("".join(row_parts))
 
 
 # ---------------------------------------------------------------------------
@@ -481,8 +746,9 @@ def export_matches_csv(tournament: TournamentData, filepath: str):
             "Player2", "Player2_Deck", "Player2_Wins",
             "Draws", "IsBye", "Result",
         ])
-        for m in tournament.matches:
-            writer.writerow([
+        # writerows consume el generador en C, sin una llamada Python por fila
+        writer.writerows(
+            (
                 m.round_number,
                 m.player1.display_name if m.player1 else "",
                 m.player1_decklist or "",
@@ -493,7 +759,9 @@ def export_matches_csv(tournament: TournamentData, filepath: str):
                 m.draws,
                 m.is_bye,
                 m.result_string,
-            ])
+            )
+            for m in tournament.matches
+        )
     print(f"[*] Matches exportados a: {filepath}")
 
 
@@ -508,20 +776,23 @@ def export_matrix_csv(matrix_data: dict, filepath: str):
         writer.writerow(["Deck vs Deck"] + decks)
         for d1 in decks:
             row = [d1]
+            row_stats = matrix.get(d1, {})
             for d2 in decks:
                 if d1 == d2:
                     row.append("mirror")
+                    continue
+                stats = row_stats.get(d2)
+                if not stats:
+                    row.append("")
+                    continue
+                w = stats.get("wins", 0)
+                l = stats.get("losses", 0)
+                d = stats.get("draws", 0)
+                total = w + l + d
+                if total > 0:
+                    row.append(f"{w}-{l}-{d} ({w / total * 100:.0f}%)")
                 else:
-                    stats = matrix.get(d1, {}).get(d2, {})
-                    w = stats.get("wins", 0)
-                    l = stats.get("losses", 0)
-                    d = stats.get("draws", 0)
-                    total = w + l + d
-                    if total > 0:
-                        wr = w / total * 100
-                        row.append(f"{w}-{l}-{d} ({wr:.0f}%)")
-                    else:
-                        row.append("")
+                    row.append("")
             writer.writerow(row)
     print(f"[*] Matriz exportada a: {filepath}")
 
@@ -594,9 +865,15 @@ def main():
 
     # Exportar
     if not args.no_export:
-        export_matches_csv(tournament, args.output)
-        export_matrix_csv(matrix_data, args.matrix_csv)
-        export_json(tournament, matrix_data, args.json)
+        # Las tres exportaciones son independientes: se escriben en paralelo
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [
+                executor.submit(export_matches_csv, tournament, args.output),
+                executor.submit(export_matrix_csv, matrix_data, args.matrix_csv),
+                executor.submit(export_json, tournament, matrix_data, args.json),
+            ]
+            for future in futures:
+                future.result()
 
 
 if __name__ == "__main__":
@@ -17,16 +17,16 @@ Uso:
 
 import argparse
 import csv
+import heapq
 import json
 import os
 import re
 import ssl
 import sys
-import time
-import urllib.parse
-import urllib.request
 from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Optional
 
 # Importar scraper base
@@ -36,22 +36,27 @@ import melee_scraper as scraper
 # ---------------------------------------------------------------------------
 # Configuración
 # ---------------------------------------------------------------------------
-REQUEST_DELAY = 0.3
-DECKLIST_BATCH_DELAY = 0.2
+DECKLIST_CONCURRENCY = 16  # descargas de decklists simultáneas
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "meta_analyzer")
 
 
 # ---------------------------------------------------------------------------
 # Modelos adicionales
 # ---------------------------------------------------------------------------
-@dataclass
+# slots=True: cada torneo instancia decenas de miles de cartas y así no
+# llevan __dict__.
+@dataclass(slots=True)
 class DecklistCard:
     name: str
     quantity: int
     card_type: str
     component: str  # "main", "sideboard", "companion"
 
+    def to_json_dict(self) -> dict:
+        return {"name": self.name, "qty": self.quantity, "type": self.card_type, "component": self.component}
 
-@dataclass
+
+@dataclass(slots=True)
 class Decklist:
     id: str
     name: str
@@ -59,8 +64,15 @@ class Decklist:
     player_name: str
     cards: list  # [DecklistCard]
 
+    def to_json_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "player": self.player_name,
+            "cards": [c.to_json_dict() for c in self.cards],
+        }
 
-@dataclass
+
+@dataclass(slots=True)
 class Archetype:
     name: str
     deck_names: list  # nombres originales agrupados
@@ -78,6 +90,43 @@ class Archetype:
     def winrate(self):
         return self.wins / self.total_matches * 100 if self.total_matches > 0 else 0
 
+    def to_json_dict(self, meta_share: float, max_decklists: int = 5) -> dict:
+        """Representación para export_full_json (con hasta max_decklists listas de ejemplo)."""
+        return {
+            "name": self.name,
+            "meta_share": round(meta_share, 2),
+            "pilots": self.count,
+            "wins": self.wins,
+            "losses": self.losses,
+            "draws": self.draws,
+            "winrate": round(self.winrate, 2),
+            "deck_names": self.deck_names,
+            "sample_decklists": [dl.to_json_dict() for dl in self.decklists[:max_decklists]],
+        }
+
+
+# ---------------------------------------------------------------------------
+# Caché en disco de respuestas raw
+# ---------------------------------------------------------------------------
+# Las rondas y decklists de un torneo ya jugado no cambian, así que se guardan
+# en CACHE_DIR/<tournament_id>/ con los helpers de caché del scraper.
+# cache_dir=None desactiva la caché; refresh=True ignora lo cacheado y lo
+# vuelve a descargar (sobrescribiéndolo).
+def fetch_decklist_details_cached(
+    decklist_id: str,
+    ctx: ssl.SSLContext,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+) -> Optional[dict]:
+    """fetch_decklist_details con caché en disco (solo se cachean respuestas válidas)."""
+    key = f"decklist_{decklist_id}"
+    raw = None if refresh else scraper._cache_load(cache_dir, key)
+    if raw is not None:
+        return raw
+    raw = fetch_decklist_details(decklist_id, ctx)
+    scraper._cache_store(cache_dir, key, raw)
+    return raw
+
 
 # ---------------------------------------------------------------------------
 # Descarga de decklists
@@ -85,16 +134,16 @@ class Archetype:
 def fetch_decklist_details(decklist_id: str, ctx: ssl.SSLContext) -> Optional[dict]:
     """Descarga los detalles de una decklist (cartas) desde melee.gg."""
     url = f"{scraper.BASE_URL}/Decklist/GetDecklistDetails?id={decklist_id}"
-    req = urllib.request.Request(url, headers={
-        "User-Agent": scraper.USER_AGENT,
-        "Accept": "application/json, */*",
-        "X-Requested-With": "XMLHttpRequest",
-    })
     try:
-        with urllib.request.urlopen(req, context=ctx, timeout=20) as resp:
-            text = resp.read().decode("utf-8", errors="replace")
-            if text.strip().startswith("{"):
-                return json.loads(text)
+        # Reutiliza la conexión keep-alive del scraper (una por hilo)
+        data = scraper._request("GET", url, ctx, headers={
+            "User-Agent": scraper.USER_AGENT,
+            "Accept": "application/json, */*",
+            "X-Requested-With": "XMLHttpRequest",
+        })
+        # json.loads parsea los bytes UTF-8 directamente, sin decode previo
+        if data.lstrip()[:1] == b"{":
+            return json.loads(data)
     except Exception:
         pass
     return None
@@ -140,66 +189,79 @@ def collect_unique_decklists(tournament: scraper.TournamentData) -> dict:
     return unique
 
 
-def extract_decklist_ids_from_matches(tournament: scraper.TournamentData) -> dict:
+def _collect_decklist_ids(raw_matches: list, deck_ids: dict) -> list:
     """
-    Re-descarga las rondas y extrae decklist IDs.
-    Retorna {decklist_id: {'name': str, 'player': str, 'deck_name': str}}.
+    Añade a `deck_ids` los decklist IDs nuevos de una ronda raw.
+    Retorna la lista de (decklist_id, info) que no se habían visto antes.
     """
-    # Los decklist IDs están disponibles en el raw JSON,
-    # pero no los guardamos antes. Vamos a re-extraerlos.
-    ctx = scraper._ssl_context()
-    deck_ids = {}
+    new_ids = []
+    for m in raw_matches:
+        for comp in m.get("Competitors", []):
+            team = comp.get("Team", {})
+            players = team.get("Players", [])
+            player_name = players[0].get("DisplayName", "") if players else ""
+            for dl in comp.get("Decklists", []):
+                did = dl.get("DecklistId")
+                if did and did not in deck_ids:
+                    info = {
+                        "name": dl.get("DecklistName", "Unknown"),
+                        "player": player_name,
+                        "format": dl.get("Format", ""),
+                    }
+                    deck_ids[did] = info
+                    new_ids.append((did, info))
+    return new_ids
+
 
-    print("[*] Extrayendo IDs de decklists de los matches...")
-    for round_id, round_name in tournament.rounds.items():
-        print(f"  [>] {round_name}...", end=" ", flush=True)
-        try:
-            raw_matches = scraper.fetch_round_matches(round_id, tournament.tournament_id, ctx)
-            for m in raw_matches:
-                for comp in m.get("Competitors", []):
-                    team = comp.get("Team", {})
-                    players = team.get("Players", [])
-                    player_name = players[0].get("DisplayName", "") if players else ""
-                    for dl in comp.get("Decklists", []):
-                        did = dl.get("DecklistId")
-                        if did and did not in deck_ids:
-                            deck_ids[did] = {
-                                "name": dl.get("DecklistName", "Unknown"),
-                                "player": player_name,
-                                "format": dl.get("Format", ""),
-                            }
-            print(f"{len(raw_matches)} matches")
-        except Exception as e:
-            print(f"ERROR: {e}")
-        time.sleep(REQUEST_DELAY)
-
-    print(f"[*] Decklists únicas encontradas: {len(deck_ids)}")
-    return deck_ids
-
-
-def download_all_decklists(deck_ids: dict, max_decks: int = 0) -> list:
+def fetch_decklists_pipeline(
+    tournament: scraper.TournamentData,
+    max_decks: int = 0,
+    concurrency: int = DECKLIST_CONCURRENCY,
+    cache_dir: Optional[str] = None,
+    refresh: bool = False,
+) -> list:
     """
-    Descarga las cartas de cada decklist única.
-    Retorna lista de Decklist.
+    Extrae los decklist IDs de las rondas y descarga sus cartas, solapando
+    ambas fases: cada decklist ID nuevo se encola en el pool de descargas en
+    cuanto aparece su ronda, mientras se siguen leyendo las rondas restantes.
+    Con max_decks > 0 deja de leer rondas en cuanto se alcanza el límite.
+    Retorna lista de Decklist (en el orden en que se descubrieron los IDs).
     """
     ctx = scraper._ssl_context()
-    decklists = []
-    items = list(deck_ids.items())
-    if max_decks > 0:
-        items = items[:max_decks]
-
-    total = len(items)
-    print(f"[*] Descargando {total} decklists...")
-
-    for i, (did, info) in enumerate(items):
-        if (i + 1) % 50 == 0 or i == 0:
-            print(f"  [{i+1}/{total}] {info['name']} ({info['player']})...")
-
-        raw = fetch_decklist_details(did, ctx)
-        if raw and raw.get("Records"):
-            dl = parse_decklist(raw, info["player"])
-            decklists.append(dl)
-        time.sleep(DECKLIST_BATCH_DELAY)
+    deck_ids = {}
+    pending = []  # [(decklist_id, info, future)] en orden de descubrimiento
+
+    print(f"[*] Extrayendo y descargando decklists ({concurrency} en paralelo)...")
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+        for round_id, round_name in tournament.rounds.items():
+            if max_decks > 0 and len(pending) >= max_decks:
+                break
+            print(f"  [>] {round_name}...", end=" ", flush=True)
+            try:
+                # scrape_tournament ya refrescó las rondas en la caché
+                raw_matches, from_cache = scraper.fetch_round_matches_cached(
+                    round_id, tournament.tournament_id, ctx, cache_dir,
+                )
+                for did, info in _collect_decklist_ids(raw_matches, deck_ids):
+                    if max_decks > 0 and len(pending) >= max_decks:
+                        break
+                    future = executor.submit(
+                        fetch_decklist_details_cached, did, ctx, cache_dir, refresh,
+                    )
+                    pending.append((did, info, future))
+                print(f"{len(raw_matches)} matches" + (" (caché)" if from_cache else ""))
+            except Exception as e:
+                print(f"ERROR: {e}")
+
+        total = len(pending)
+        print(f"[*] Decklists únicas encontradas: {len(deck_ids)}")
+        decklists = []
+        for i, (did, info, future) in enumerate(pending):
+            if (i + 1) % 50 == 0 or i == 0:
+                print(f"  [{i+1}/{total}] {info['name']} ({info['player']})...")
+            raw = future.result()
+            if raw and raw.get("Records"):
+                decklists.append(parse_decklist(raw, info["player"]))
 
     print(f"[*] Decklists descargadas: {len(decklists)}/{total}")
     return decklists
@@ -208,14 +270,22 @@ def download_all_decklists(deck_ids: dict, max_decks: int = 0) -> list:
 # ---------------------------------------------------------------------------
 # Agrupación en arquetipos
 # ---------------------------------------------------------------------------
+# Patrones de normalización (compilados una sola vez)
+_RE_PAREN = re.compile(r'\s*\(.*?\)\s*')  # (variant)
+_RE_VERSION = re.compile(r'\s*v\d+\s*$', re.I)  # v2, v3
+_RE_HASH = re.compile(r'\s*#\d+\s*$')  # #2
+_RE_WS = re.compile(r'\s+')
+
+
+@lru_cache(maxsize=4096)
 def normalize_deck_name(name: str) -> str:
     """Normaliza un nombre de deck para agrupación en arquetipo."""
     name = name.strip()
     # Remover variaciones comunes
-    name = re.sub(r'\s*\(.*?\)\s*', '', name)  # (variant)
-    name = re.sub(r'\s*v\d+\s*$', '', name, flags=re.I)  # v2, v3
-    name = re.sub(r'\s*#\d+\s*$', '', name)  # #2
-    name = re.sub(r'\s+', ' ', name).strip()
+    name = _RE_PAREN.sub('', name)
+    name = _RE_VERSION.sub('', name)
+    name = _RE_HASH.sub('', name)
+    name = _RE_WS.sub(' ', name).strip()
     return name
 
 
@@ -269,25 +339,42 @@ ARCHETYPE_ALIASES = {
     "Rakdos Midrange": "Rakdos Midrange",
 }
 
+def _canon(name: str) -> str:
+    """Forma canónica para comparar nombres: espacios colapsados y minúsculas."""
+    return _RE_WS.sub(" ", name.strip()).lower()
+
+
+def _build_alias_index() -> dict:
+    """Índice {forma canónica: arquetipo} de ARCHETYPE_ALIASES (gana el primero)."""
+    index = {}
+    for alias, archetype in ARCHETYPE_ALIASES.items():
+        index.setdefault(_canon(alias), archetype)
+    return index
+
+
+_ALIAS_NORM = _build_alias_index()
+
+
+def reload_archetype_aliases():
+    """Recalcula el índice de aliases tras modificar ARCHETYPE_ALIASES en runtime."""
+    global _ALIAS_NORM
+    _ALIAS_NORM = _build_alias_index()
+    classify_archetype.cache_clear()
 
+
+@lru_cache(maxsize=4096)
 def classify_archetype(deck_name: str) -> str:
     """
     Clasifica un nombre de deck en su arquetipo.
-    Primero busca en aliases, luego usa el nombre normalizado.
+    Busca el nombre normalizado en los aliases (sin distinguir mayúsculas);
+    si no está, usa el nombre normalizado.
+
+    El resultado se memoiza: si se modifica ARCHETYPE_ALIASES en tiempo de
+    ejecución hay que llamar a reload_archetype_aliases().
     """
     normalized = normalize_deck_name(deck_name)
-
-    # Búsqueda exacta en aliases
-    if normalized in ARCHETYPE_ALIASES:
-        return ARCHETYPE_ALIASES[normalized]
-
-    # Búsqueda case-insensitive
-    for alias, archetype in ARCHETYPE_ALIASES.items():
-        if normalized.lower() == alias.lower():
-            return archetype
-
-    # Si no se encuentra, usar el nombre normalizado
-    return normalized
+    # normalize_deck_name ya colapsa espacios: basta con pasar a minúsculas
+    return _ALIAS_NORM.get(normalized.lower(), normalized)
 
 
 def build_archetype_map(tournament: scraper.TournamentData) -> dict:
@@ -302,15 +389,16 @@ def build_archetype_map(tournament: scraper.TournamentData) -> dict:
         if match.player2_decklist:
             deck_names.add(match.player2_decklist)
 
-    mapping = {}
-    for name in deck_names:
-        mapping[name] = classify_archetype(name)
-    return mapping
+    return {name: classify_archetype(name) for name in deck_names}
 
 
 # ---------------------------------------------------------------------------
 # Análisis de metagame
 # ---------------------------------------------------------------------------
+# Índice de resultado (0 victoria, 1 derrota, 2 empate) visto desde el rival
+_FLIPPED_RESULT = (1, 0, 2)
+
+
 @dataclass
 class MetagameData:
     archetypes: dict  # {arch_name: Archetype}
@@ -320,6 +408,7 @@ class MetagameData:
     total_matches: int
     deck_to_archetype: dict  # {deck_name: arch_name}
     decklists: dict  # {deck_name: [Decklist]}
+    ordered_archetypes: list  # nombres por nº de pilotos desc
 
 
 def analyze_metagame(
@@ -329,73 +418,86 @@ def analyze_metagame(
 ) -> MetagameData:
     """Realiza el análisis completo del metagame."""
 
-    # Contar apariciones por arquetipo (cuántos jugadores lo usan)
+    # Una sola pasada sobre los matches: se resuelve el arquetipo de cada
+    # jugador (si cambia de deck durante el torneo, cuenta el último) y se
+    # emite directamente la clave (arch1, arch2, resultado) de cada match
+    # con ambos arquetipos conocidos, sin listas intermedias.
+    # resultado: 0 = gana p1, 1 = gana p2, 2 = empate
+    keys = []
+    append_key = keys.append
     player_archetypes = {}  # {player_id: archetype}
+    bye_count = 0
     for match in tournament.matches:
-        if match.player1 and match.player1_decklist:
-            arch = archetype_map.get(match.player1_decklist, match.player1_decklist)
-            player_archetypes[match.player1.id] = arch
-        if match.player2 and match.player2_decklist:
-            arch = archetype_map.get(match.player2_decklist, match.player2_decklist)
-            player_archetypes[match.player2.id] = arch
+        p1 = match.player1
+        p2 = match.player2
+        d1 = match.player1_decklist
+        d2 = match.player2_decklist
+        a1 = a2 = None
+        if p1 and d1:
+            a1 = player_archetypes[p1.id] = archetype_map.get(d1, d1)
+        if p2 and d2:
+            a2 = player_archetypes[p2.id] = archetype_map.get(d2, d2)
+        if match.is_bye:
+            bye_count += 1
+        elif a1 is not None and a2 is not None:
+            w1 = match.player1_wins
+            w2 = match.player2_wins
+            append_key((a1, a2, 0 if w1 > w2 else 1 if w2 > w1 else 2))
 
-    # Meta share
+    # Meta share (cuántos jugadores usan cada arquetipo)
     arch_counts = Counter(player_archetypes.values())
     total_players_with_deck = len(player_archetypes)
-    meta_share = {
-        arch: count / total_players_with_deck * 100
-        for arch, count in arch_counts.items()
-    }
-
-    # Matchup matrix
-    matchups = defaultdict(lambda: defaultdict(lambda: {
-        "wins": 0, "losses": 0, "draws": 0, "total": 0
-    }))
+    inv_total = 100.0 / total_players_with_deck if total_players_with_deck else 0.0
+    meta_share = {arch: count * inv_total for arch, count in arch_counts.items()}
+
+    # Agrupar los matches idénticos con Counter, que cuenta en C; después
+    # cada grupo se suma a la matriz una sola vez, así que el bucle en Python
+    # es O(arquetipos²) y no O(matches).
+    outcomes = Counter(keys)
+
+    # Matchup matrix plana: {(arch1, arch2): [wins, losses, draws, total]}
+    matchups = defaultdict(lambda: [0, 0, 0, 0])
+
+    # Stats per archetype: {arch: [wins, losses, draws]}
+    arch_stats = defaultdict(lambda: [0, 0, 0])
+
+    for (a1, a2, result), n in outcomes.items():
+        flipped = _FLIPPED_RESULT[result]  # el resultado visto desde el rival
+        m12 = matchups[(a1, a2)]
+        m21 = matchups[(a2, a1)]
+        m12[result] += n
+        m21[flipped] += n
+        m12[3] += n
+        m21[3] += n
+        arch_stats[a1][result] += n
+        arch_stats[a2][flipped] += n
+
+    # Volver al formato anidado {arch1: {arch2: {wins, losses, draws, total}}}
+    matchup_matrix = {}
+    for (a1, a2), (w, l, d, t) in matchups.items():
+        matchup_matrix.setdefault(a1, {})[a2] = {"wins": w, "losses": l, "draws": d, "total": t}
 
-    # Stats per archetype
-    arch_stats = defaultdict(lambda: {"wins": 0, "losses": 0, "draws": 0})
-
-    for match in tournament.matches:
-        if match.is_bye or not match.player1 or not match.player2:
-            continue
-        if not match.player1_decklist or not match.player2_decklist:
-            continue
+    # Construct Archetype objects
+    deck_names_by_arch = defaultdict(list)  # índice inverso {arch: [deck_name]}
+    for dn, an in archetype_map.items():
+        deck_names_by_arch[an].append(dn)
 
-        a1 = archetype_map.get(match.player1_decklist, match.player1_decklist)
-        a2 = archetype_map.get(match.player2_decklist, match.player2_decklist)
-
-        if match.player1_wins > match.player2_wins:
-            matchups[a1][a2]["wins"] += 1
-            matchups[a2][a1]["losses"] += 1
-            arch_stats[a1]["wins"] += 1
-            arch_stats[a2]["losses"] += 1
-        elif match.player2_wins > match.player1_wins:
-            matchups[a1][a2]["losses"] += 1
-            matchups[a2][a1]["wins"] += 1
-            arch_stats[a1]["losses"] += 1
-            arch_stats[a2]["wins"] += 1
-        else:
-            matchups[a1][a2]["draws"] += 1
-            matchups[a2][a1]["draws"] += 1
-            arch_stats[a1]["draws"] += 1
-            arch_stats[a2]["draws"] += 1
-
-        matchups[a1][a2]["total"] += 1
-        matchups[a2][a1]["total"] += 1
+    # Orden canónico (más pilotos primero), calculado una sola vez y
+    # reutilizado por todas las exportaciones
+    ordered_archetypes = sorted(arch_counts, key=arch_counts.__getitem__, reverse=True)
 
-    # Construct Archetype objects
     archetypes = {}
-    for arch_name in sorted(meta_share.keys(), key=lambda x: meta_share[x], reverse=True):
-        deck_names = [dn for dn, an in archetype_map.items() if an == arch_name]
+    for arch_name in ordered_archetypes:
+        deck_names = deck_names_by_arch.get(arch_name, [])
         s = arch_stats[arch_name]
         archetypes[arch_name] = Archetype(
             name=arch_name,
             deck_names=sorted(set(deck_names)),
             count=arch_counts[arch_name],
             decklists=[],
-            wins=s["wins"],
-            losses=s["losses"],
-            draws=s["draws"],
+            wins=s[0],
+            losses=s[1],
+            draws=s[2],
         )
 
     # Attach decklists
@@ -409,12 +511,13 @@ def analyze_metagame(
 
     return MetagameData(
         archetypes=archetypes,
-        matchup_matrix=dict(matchups),
+        matchup_matrix=matchup_matrix,
         meta_share=meta_share,
         total_players=total_players_with_deck,
-        total_matches=len([m for m in tournament.matches if not m.is_bye]),
+        total_matches=len(tournament.matches) - bye_count,
         deck_to_archetype=archetype_map,
         decklists=dict(decklists_by_deck),
+        ordered_archetypes=ordered_archetypes,
     )
 
 
@@ -423,18 +526,20 @@ def analyze_metagame(
 # ---------------------------------------------------------------------------
 def export_decklists_csv(decklists: list, filepath: str):
     """Exporta todas las decklists con sus cartas a CSV."""
-    with open(filepath, "w", newline="", encoding="utf-8") as f:
+    with open(filepath, "w", newline="", encoding="utf-8", buffering=1 << 20) as f:
         writer = csv.writer(f)
         writer.writerow([
             "DecklistID", "DeckName", "PlayerName", "Format",
             "Component", "CardName", "Quantity", "CardType",
         ])
-        for dl in decklists:
-            for card in dl.cards:
-                writer.writerow([
-                    dl.id, dl.name, dl.player_name, dl.format_name,
-                    card.component, card.name, card.quantity, card.card_type,
-                ])
+        writer.writerows(
+            (
+                dl.id, dl.name, dl.player_name, dl.format_name,
+                card.component, card.name, card.quantity, card.card_type,
+            )
+            for dl in decklists
+            for card in dl.cards
+        )
     print(f"[*] Decklists exportadas a: {filepath}")
 
 
@@ -446,11 +551,8 @@ def export_archetype_summary_csv(meta: MetagameData, filepath: str):
             "Archetype", "MetaShare%", "Players", "Wins", "Losses", "Draws",
             "TotalMatches", "Winrate%", "DeckNames",
         ])
-        for arch_name, arch in sorted(
-            meta.archetypes.items(),
-            key=lambda x: x[1].count,
-            reverse=True,
-        ):
+        for arch_name in meta.ordered_archetypes:
+            arch = meta.archetypes[arch_name]
             writer.writerow([
                 arch_name,
                 f"{meta.meta_share.get(arch_name, 0):.1f}",
@@ -468,6 +570,14 @@ def export_archetype_summary_csv(meta: MetagameData, filepath: str):
 # ---------------------------------------------------------------------------
 # Generación de HTML interactivo (estilo j6e meta analyzer)
 # ---------------------------------------------------------------------------
+# Encoder compacto para los datos embebidos en el <script>: sin indent usa el
+# encoder en C de json, y sin espacios tras ',' y ':' el HTML pesa menos.
+_js_json = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+
+# Códigos numéricos de componente en DECKLISTS_DATA (índices de COMPONENTS en JS)
+_COMPONENT_CODES = {"main": 0, "sideboard": 1, "companion": 2}
+
+
 def generate_html_dashboard(
     meta: MetagameData,
     tournament: scraper.TournamentData,
@@ -477,30 +587,30 @@ def generate_html_dashboard(
 
     # Filtrar arquetipos con suficientes partidas para la matriz
     MIN_FOR_MATRIX = 3
-    sorted_archs = sorted(
-        meta.archetypes.values(),
-        key=lambda a: a.count,
-        reverse=True,
-    )
+    sorted_archs = [meta.archetypes[name] for name in meta.ordered_archetypes]
     matrix_archs = [a for a in sorted_archs if a.total_matches >= MIN_FOR_MATRIX]
     matrix_names = [a.name for a in matrix_archs]
 
-    # Preparar datos para JS
-    matrix_js_data = []
-    for a1 in matrix_names:
-        row = {}
-        for a2 in matrix_names:
-            if a1 == a2:
-                row[a2] = {"type": "mirror"}
-            else:
-                stats = meta.matchup_matrix.get(a1, {}).get(a2, {})
-                w = stats.get("wins", 0)
-                l = stats.get("losses", 0)
-                d = stats.get("draws", 0)
-                t = w + l + d
-                wr = w / t * 100 if t > 0 else 50
-                row[a2] = {"wins": w, "losses": l, "draws": d, "total": t, "winrate": round(wr, 1)}
-        matrix_js_data.append(row)
+    # Preparar datos para JS: matriz densa indexada igual que matrix_names.
+    # Cada celda es -1 (mirror), None (sin partidas) o [w, l, d, winrate].
+    n = len(matrix_names)
+    matrix_js_data = [[None] * n for _ in range(n)]
+    for i, a1 in enumerate(matrix_names):
+        row_stats = meta.matchup_matrix.get(a1, {})
+        row = matrix_js_data[i]
+        for j, a2 in enumerate(matrix_names):
+            if i == j:
+                row[j] = -1
+                continue
+            stats = row_stats.get(a2)
+            if not stats:
+                continue
+            w = stats.get("wins", 0)
+            l = stats.get("losses", 0)
+            d = stats.get("draws", 0)
+            t = w + l + d
+            if t > 0:
+                row[j] = [w, l, d, round(w / t * 100, 1)]
 
     meta_share_data = []
     for arch in sorted_archs:
@@ -517,21 +627,34 @@ def generate_html_dashboard(
             "totalMatches": arch.total_matches,
         })
 
-    # Datos de decklists por arquetipo
+    # Datos de decklists por arquetipo. Cada carta única se guarda una sola
+    # vez en cards_by_id ([nombre, tipo]) y las listas, como arrays
+    # posicionales, la referencian por índice:
+    # [nombre, jugador, [[card_id, qty, componente], ...]]
+    card_index = {}  # {(nombre, tipo): card_id}
+    cards_by_id = []
     decklists_data = {}
     for arch_name, arch in meta.archetypes.items():
         if arch.decklists:
-            decklists_data[arch_name] = []
+            lists = decklists_data[arch_name] = []
             for dl in arch.decklists[:10]:  # max 10 listas por arquetipo
-                cards = [
-                    {"name": c.name, "qty": c.quantity, "type": c.card_type, "component": c.component}
-                    for c in dl.cards
-                ]
-                decklists_data[arch_name].append({
-                    "name": dl.name,
-                    "player": dl.player_name,
-                    "cards": cards,
-                })
+                entries = []
+                for c in dl.cards:
+                    key = (c.name, c.card_type)
+                    card_id = card_index.get(key)
+                    if card_id is None:
+                        card_id = card_index[key] = len(cards_by_id)
+                        cards_by_id.append([c.name, c.card_type])
+                    entries.append([card_id, c.quantity, _COMPONENT_CODES.get(c.component, 0)])
+                lists.append([dl.name, dl.player_name, entries])
+
+    # Las decklists son lo más pesado del dashboard y solo hacen falta en su
+    # pestaña: van en un bloque <script type="application/json"> que el
+    # navegador no compila al cargar y se parsean la primera vez que se
+    # abre la pestaña. Siguen embebidas para que el HTML funcione desde
+    # file:// (donde fetch() de un .json vecino no está permitido).
+    # "</" se escapa para que ningún nombre pueda cerrar el <script>.
+    decklists_json = _js_json({"cards": cards_by_id, "lists": decklists_data}).replace("</", "<\\/")
 
     html = f"""<!DOCTYPE html>
 <html lang="es">
@@ -682,12 +805,41 @@ body {{ font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', system-ui, s
 
 <div class="tooltip" id="tooltip" style="display:none"></div>
 
+<script type="application/json" id="decklists-data">{decklists_json}</script>
 <script>
 // ===================== DATA =====================
-const META_DATA = {json.dumps(meta_share_data, ensure_ascii=False)};
-const MATRIX_NAMES = {json.dumps(matrix_names, ensure_ascii=False)};
-const MATRIX_DATA = {json.dumps(matrix_js_data, ensure_ascii=False)};
-const DECKLISTS_DATA = {json.dumps(decklists_data, ensure_ascii=False)};
+const META_DATA = {_js_json(meta_share_data)};
+const MATRIX_NAMES = {_js_json(matrix_names)};
+const MATRIX_DATA = {_js_json(matrix_js_data)};
+// Decklists: se parsean bajo demanda desde #decklists-data (ver ensureDecklists)
+let CARDS = null;
+let DECKLISTS = null;
+// Decodificadores de los arrays posicionales de las decklists. Cada lista
+// se reparte en main/side/comp (con sus totales) en una sola pasada.
+function cardObj(c) {{ return {{name: CARDS[c[0]][0], type: CARDS[c[0]][1], qty: c[1], component: c[2]}}; }}
+function deckObj(a) {{
+    const dl = {{name: a[0], player: a[1], main: [], side: [], comp: [], mainCount: 0, sideCount: 0}};
+    a[2].forEach(raw => {{
+        const c = cardObj(raw);
+        if (c.component === 0) {{ dl.main.push(c); dl.mainCount += c.qty; }}
+        else if (c.component === 1) {{ dl.side.push(c); dl.sideCount += c.qty; }}
+        else dl.comp.push(c);
+    }});
+    return dl;
+}}
+// Parseo y decodificado una sola vez, al primer uso: {{arquetipo: [deckObj]}}
+function ensureDecklists() {{
+    if (DECKLISTS === null) {{
+        const data = JSON.parse(document.getElementById('decklists-data').textContent);
+        CARDS = data.cards;
+        DECKLISTS = Object.fromEntries(Object.entries(data.lists).map(([arch, lists]) => [arch, lists.map(deckObj)]));
+    }}
+    return DECKLISTS;
+}}
+// Nombres en minúsculas precalculados para las búsquedas (mismo orden que META_DATA)
+const META_NAMES_LC = META_DATA.map(a => a.name.toLowerCase());
+// Agrupa una ráfaga de eventos (p. ej. tecleo) en una sola llamada
+function debounce(fn, ms) {{ let t; return () => {{ clearTimeout(t); t = setTimeout(fn, ms); }}; }}
 
 // ===================== TABS =====================
 document.querySelectorAll('.tab').forEach(tab => {{
@@ -696,6 +848,7 @@ document.querySelectorAll('.tab').forEach(tab => {{
         document.querySelectorAll('.panel').forEach(p => p.classList.remove('active'));
         tab.classList.add('active');
         document.getElementById(tab.dataset.panel).classList.add('active');
+        if (tab.dataset.panel === 'decklists' && !decklistsRendered) renderDecklists();
     }});
 }});
 
@@ -705,7 +858,7 @@ function renderMetaTable() {{
     const minM = parseInt(document.getElementById('min-matches-filter').value) || 0;
     const search = document.getElementById('meta-search').value.toLowerCase();
     const tbody = document.getElementById('meta-body');
-    let filtered = META_DATA.filter(a => a.totalMatches >= minM && a.name.toLowerCase().includes(search));
+    let filtered = META_DATA.filter((a, i) => a.totalMatches >= minM && META_NAMES_LC[i].includes(search));
     const maxShare = Math.max(...filtered.map(a => a.share), 1);
     tbody.innerHTML = filtered.map((a, i) => `
         <tr>
@@ -726,102 +879,137 @@ function renderMetaTable() {{
     `).join('');
 }}
 document.getElementById('min-matches-filter').addEventListener('input', renderMetaTable);
-document.getElementById('meta-search').addEventListener('input', renderMetaTable);
+document.getElementById('meta-search').addEventListener('input', debounce(renderMetaTable, 50));
 renderMetaTable();
 
 // ===================== MATRIX =====================
+// La matriz se monta con nodos del DOM en vez de reparsear una cadena HTML:
+// la cabecera se crea una sola vez y cada cambio del filtro solo sustituye
+// el <tbody>.
+function el(tag, cls, text) {{
+    const e = document.createElement(tag);
+    if (cls) e.className = cls;
+    if (text !== undefined) e.textContent = text;
+    return e;
+}}
+function renderMatrixHead(table) {{
+    const thead = el('thead');
+    const tr = el('tr');
+    tr.appendChild(el('th', 'row-header', 'VS'));
+    MATRIX_NAMES.forEach(n => {{
+        const th = el('th', '', n.length > 15 ? n.slice(0,14)+'…' : n);
+        th.title = n;
+        tr.appendChild(th);
+    }});
+    thead.appendChild(tr);
+    table.appendChild(thead);
+}}
 function renderMatrix() {{
     const minM = parseInt(document.getElementById('matrix-min-matches').value) || 1;
     const table = document.getElementById('matrix-table');
-    let html = '<thead><tr><th class="row-header">VS</th>';
-    MATRIX_NAMES.forEach(n => {{ html += `<th title="${{n}}">${{n.length > 15 ? n.slice(0,14)+'…' : n}}</th>`; }});
-    html += '</tr></thead><tbody>';
+    if (!table.tHead) renderMatrixHead(table);
+    const tbody = el('tbody');
     MATRIX_NAMES.forEach((n1, i) => {{
-        html += `<tr><td class="row-header" title="${{n1}}">${{n1.length > 18 ? n1.slice(0,17)+'…' : n1}}</td>`;
+        const tr = el('tr');
+        const rh = el('td', 'row-header', n1.length > 18 ? n1.slice(0,17)+'…' : n1);
+        rh.title = n1;
+        tr.appendChild(rh);
         MATRIX_NAMES.forEach((n2, j) => {{
-            const cell = MATRIX_DATA[i][n2];
-            if (cell.type === 'mirror') {{
-                html += '<td class="mirror">—</td>';
-            }} else if (cell.total < minM) {{
-                html += '<td class="no-data">—</td>';
+            const cell = MATRIX_DATA[i][j];  // -1 mirror, null sin datos, [w, l, d, winrate]
+            if (cell === -1) {{
+                tr.appendChild(el('td', 'mirror', '—'));
+            }} else if (cell === null || cell[0] + cell[1] + cell[2] < minM) {{
+                tr.appendChild(el('td', 'no-data', '—'));
             }} else {{
-                const cls = cell.winrate >= 55 ? 'good' : cell.winrate >= 45 ? 'ok' : 'bad';
-                html += `<td class="${{cls}}" data-a1="${{n1}}" data-a2="${{n2}}" data-w="${{cell.wins}}" data-l="${{cell.losses}}" data-d="${{cell.draws}}" data-t="${{cell.total}}" data-wr="${{cell.winrate}}">${{cell.winrate}}%<br><span style="font-size:0.65rem;opacity:0.7">${{cell.wins}}-${{cell.losses}}-${{cell.draws}}</span></td>`;
+                const [w, l, d, wr] = cell;
+                const td = el('td', wr >= 55 ? 'good' : wr >= 45 ? 'ok' : 'bad', wr + '%');
+                Object.assign(td.dataset, {{a1: n1, a2: n2, w, l, d, t: w + l + d, wr}});
+                td.appendChild(el('br'));
+                const record = el('span', '', `${{w}}-${{l}}-${{d}}`);
+                record.style.cssText = 'font-size:0.65rem;opacity:0.7';
+                td.appendChild(record);
+                tr.appendChild(td);
             }}
         }});
-        html += '</tr>';
-    }});
-    html += '</tbody>';
-    table.innerHTML = html;
-
-    // Tooltips
-    table.querySelectorAll('td[data-a1]').forEach(td => {{
-        td.addEventListener('mouseenter', e => {{
-            const tt = document.getElementById('tooltip');
-            tt.innerHTML = `<div class="tt-title">${{td.dataset.a1}} vs ${{td.dataset.a2}}</div>
-                <div class="tt-stat">Win rate: ${{td.dataset.wr}}%</div>
-                <div class="tt-stat">Record: ${{td.dataset.w}}-${{td.dataset.l}}-${{td.dataset.d}} (${{td.dataset.t}} matches)</div>`;
-            tt.style.display = 'block';
-            tt.style.left = (e.clientX + 12) + 'px';
-            tt.style.top = (e.clientY + 12) + 'px';
-        }});
-        td.addEventListener('mouseleave', () => {{ document.getElementById('tooltip').style.display = 'none'; }});
-        td.addEventListener('mousemove', e => {{
-            const tt = document.getElementById('tooltip');
-            tt.style.left = (e.clientX + 12) + 'px';
-            tt.style.top = (e.clientY + 12) + 'px';
-        }});
+        tbody.appendChild(tr);
     }});
+    if (table.tBodies[0]) table.replaceChild(tbody, table.tBodies[0]);
+    else table.appendChild(tbody);
 }}
+
+// Tooltip: un único listener delegado en la tabla (sobrevive a los re-renders
+// del <tbody>) en lugar de tres por celda
+const matrixTable = document.getElementById('matrix-table');
+const matrixTooltip = document.getElementById('tooltip');
+let tooltipCell = null;
+matrixTable.addEventListener('mousemove', e => {{
+    const td = e.target.closest('td[data-a1]');
+    if (!td) {{
+        matrixTooltip.style.display = 'none';
+        tooltipCell = null;
+        return;
+    }}
+    if (td !== tooltipCell) {{
+        tooltipCell = td;
+        matrixTooltip.innerHTML = `<div class="tt-title">${{td.dataset.a1}} vs ${{td.dataset.a2}}</div>
+            <div class="tt-stat">Win rate: ${{td.dataset.wr}}%</div>
+            <div class="tt-stat">Record: ${{td.dataset.w}}-${{td.dataset.l}}-${{td.dataset.d}} (${{td.dataset.t}} matches)</div>`;
+    }}
+    matrixTooltip.style.cssText = `display:block;left:${{e.clientX + 12}}px;top:${{e.clientY + 12}}px`;
+}});
+matrixTable.addEventListener('mouseleave', () => {{
+    matrixTooltip.style.display = 'none';
+    tooltipCell = null;
+}});
 document.getElementById('matrix-min-matches').addEventListener('input', renderMatrix);
 renderMatrix();
 
 // ===================== DECKLISTS =====================
+let decklistsRendered = false;  // la pestaña se pinta al abrirla por primera vez
 function renderDecklists() {{
+    decklistsRendered = true;
+    const decklists = ensureDecklists();
     const search = document.getElementById('deck-search').value.toLowerCase();
     const container = document.getElementById('decklists-container');
-    let html = '';
-    META_DATA.filter(a => a.name.toLowerCase().includes(search)).forEach(arch => {{
-        const lists = DECKLISTS_DATA[arch.name] || [];
-        html += `<div class="decklist-section">
+    const parts = [];
+    META_DATA.filter((a, i) => META_NAMES_LC[i].includes(search)).forEach(arch => {{
+        const lists = decklists[arch.name] || [];
+        parts.push(`<div class="decklist-section">
             <div class="arch-header" onclick="this.nextElementSibling.classList.toggle('open')">
                 <h3>${{arch.name}}</h3>
                 <span class="badge">${{arch.share}}% meta</span>
                 <span class="badge" style="background:#065f46">${{arch.winrate}}% WR</span>
                 <span style="color:#6b7280;font-size:0.8rem">${{lists.length}} lists | ${{arch.deckNames.join(', ')}}</span>
             </div>
-            <div class="deck-cards">`;
+            <div class="deck-cards">`);
         if (lists.length === 0) {{
-            html += '<p style="color:#6b7280;padding:1rem">No hay decklists descargadas para este arquetipo.</p>';
+            parts.push('<p style="color:#6b7280;padding:1rem">No hay decklists descargadas para este arquetipo.</p>');
         }} else {{
-            html += '<div class="card-list">';
+            parts.push('<div class="card-list">');
             lists.forEach(dl => {{
-                html += `<div class="deck-card"><h4>${{dl.name}}</h4><div class="player">${{dl.player}}</div>`;
-                const main = dl.cards.filter(c => c.component === 'main');
-                const side = dl.cards.filter(c => c.component === 'sideboard');
-                const comp = dl.cards.filter(c => c.component === 'companion');
+                parts.push(`<div class="deck-card"><h4>${{dl.name}}</h4><div class="player">${{dl.player}}</div>`);
+                const {{main, side, comp}} = dl;
                 if (main.length) {{
-                    html += '<div class="card-section-title">Main Deck (' + main.reduce((s,c) => s+c.qty, 0) + ')</div>';
-                    main.forEach(c => {{ html += `<div class="card-entry"><span class="qty">${{c.qty}}</span>${{c.name}}</div>`; }});
+                    parts.push('<div class="card-section-title">Main Deck (' + dl.mainCount + ')</div>');
+                    main.forEach(c => {{ parts.push(`<div class="card-entry"><span class="qty">${{c.qty}}</span>${{c.name}}</div>`); }});
                 }}
                 if (side.length) {{
-                    html += '<div class="card-section-title">Sideboard (' + side.reduce((s,c) => s+c.qty, 0) + ')</div>';
-                    side.forEach(c => {{ html += `<div class="card-entry"><span class="qty">${{c.qty}}</span>${{c.name}}</div>`; }});
+                    parts.push('<div class="card-section-title">Sideboard (' + dl.sideCount + ')</div>');
+                    side.forEach(c => {{ parts.push(`<div class="card-entry"><span class="qty">${{c.qty}}</span>${{c.name}}</div>`); }});
                 }}
                 if (comp.length) {{
-                    html += '<div class="card-section-title">Companion</div>';
-                    comp.forEach(c => {{ html += `<div class="card-entry"><span class="qty">${{c.qty}}</span>${{c.name}}</div>`; }});
+                    parts.push('<div class="card-section-title">Companion</div>');
+                    comp.forEach(c => {{ parts.push(`<div class="card-entry"><span class="qty">${{c.qty}}</span>${{c.name}}</div>`); }});
                 }}
-                html += '</div>';
+                parts.push('</div>');
             }});
-            html += '</div>';
+            parts.push('</div>');
         }}
-        html += '</div></div>';
+        parts.push('</div></div>');
     }});
-    container.innerHTML = html;
+    container.innerHTML = parts.join('');
 }}
-document.getElementById('deck-search').addEventListener('input', renderDecklists);
-renderDecklists();
+document.getElementById('deck-search').addEventListener('input', debounce(renderDecklists, 50));
 </script>
 </body>
 </html>"""
@@ -834,8 +1022,19 @@ renderDecklists();
 # ---------------------------------------------------------------------------
 # Exportar todo a JSON
 # ---------------------------------------------------------------------------
-def export_full_json(meta: MetagameData, tournament: scraper.TournamentData, filepath: str):
-    """Exporta todos los datos del análisis a JSON."""
+def export_full_json(
+    meta: MetagameData,
+    tournament: scraper.TournamentData,
+    filepath: str,
+    pretty: bool = False,
+):
+    """Exporta todos los datos del análisis a JSON.
+
+    Por defecto se escribe compacto (sin indentación ni espacios) y en
+    streaming al fichero; con pretty=True se indenta para leerlo a mano.
+    """
+    share = meta.meta_share.get
+    archetypes = meta.archetypes
     output = {
         "tournament": {
             "id": tournament.tournament_id,
@@ -845,39 +1044,19 @@ def export_full_json(meta: MetagameData, tournament: scraper.TournamentData, fil
             "total_players": meta.total_players,
         },
         "archetypes": [
-            {
-                "name": arch.name,
-                "meta_share": round(meta.meta_share.get(arch.name, 0), 2),
-                "pilots": arch.count,
-                "wins": arch.wins,
-                "losses": arch.losses,
-                "draws": arch.draws,
-                "winrate": round(arch.winrate, 2),
-                "deck_names": arch.deck_names,
-                "sample_decklists": [
-                    {
-                        "name": dl.name,
-                        "player": dl.player_name,
-                        "cards": [
-                            {"name": c.name, "qty": c.quantity, "type": c.card_type, "component": c.component}
-                            for c in dl.cards
-                        ],
-                    }
-                    for dl in arch.decklists[:5]
-                ],
-            }
-            for arch in sorted(meta.archetypes.values(), key=lambda a: a.count, reverse=True)
+            archetypes[name].to_json_dict(share(name, 0))
+            for name in meta.ordered_archetypes
         ],
-        "matchup_matrix": {
-            a1: {
-                a2: stats for a2, stats in inner.items()
-            }
-            for a1, inner in meta.matchup_matrix.items()
-        },
+        # Solo se serializa, así que no hace falta copiarla
+        "matchup_matrix": meta.matchup_matrix,
         "deck_to_archetype": meta.deck_to_archetype,
     }
-    with open(filepath, "w", encoding="utf-8") as f:
-        json.dump(output, f, ensure_ascii=False, indent=2)
+    if pretty:
+        dump_kwargs = {"indent": 2}
+    else:
+        dump_kwargs = {"separators": (",", ":")}
+    with open(filepath, "w", encoding="utf-8", buffering=1 << 20) as f:
+        json.dump(output, f, ensure_ascii=False, **dump_kwargs)
     print(f"[*] JSON completo exportado a: {filepath}")
 
 
@@ -886,47 +1065,73 @@ def export_full_json(meta: MetagameData, tournament: scraper.TournamentData, fil
 # ---------------------------------------------------------------------------
 def main():
     parser = argparse.ArgumentParser(description="MTG Meta Analyzer para melee.gg")
-    parser.add_argument("-t", "--tournament", default=scraper.DEFAULT_TOURNAMENT_ID, help="ID del torneo")
+    parser.add_argument("-t", "--tournament", default=None, help="ID del torneo (por defecto, el de melee_scraper)")
     parser.add_argument("--skip-decklists", action="store_true", help="No descargar cartas de decklists")
     parser.add_argument("--max-decklists", type=int, default=0, help="Máximo de decklists a descargar (0=todas)")
+    parser.add_argument("--concurrency", type=int, default=DECKLIST_CONCURRENCY, help="Descargas de decklists en paralelo")
+    parser.add_argument("--no-cache", action="store_true", help="No usar la caché en disco de rondas/decklists")
+    parser.add_argument("--refresh", action="store_true", help="Ignorar la caché y volver a descargar (actualizándola)")
+    parser.add_argument("--profile", action="store_true", help="Mostrar estadísticas de red (intentos, throttling, tasa)")
     parser.add_argument("--min-matches", type=int, default=5, help="Mínimo de partidas para matriz")
     parser.add_argument("--html", default="meta_analyzer.html", help="Archivo HTML de salida")
     parser.add_argument("--json-out", default="meta_analysis.json", help="Archivo JSON de salida")
+    parser.add_argument("--pretty", action="store_true", help="Indentar el JSON de salida (más legible, más grande)")
     args = parser.parse_args()
 
-    # 1. Scrape tournament
-    tournament = scraper.scrape_tournament(args.tournament)
+    # 1. Scrape tournament (las rondas se leen de la caché si ya están)
+    tournament_id = args.tournament or scraper.DEFAULT_TOURNAMENT_ID
+    cache_dir = None if args.no_cache else os.path.join(CACHE_DIR, tournament_id)
+    tournament = scraper.scrape_tournament(tournament_id, cache_dir, args.refresh)
 
     # 2. Build archetype map
     archetype_map = build_archetype_map(tournament)
-    print(f"\n[*] Arquetipos identificados: {len(set(archetype_map.values()))}")
-    for arch, count in Counter(archetype_map.values()).most_common(20):
-        print(f"  {arch}: {count} deck names")
 
     # 3. Download decklists (optional)
     decklists = []
     if not args.skip_decklists:
-        deck_ids = extract_decklist_ids_from_matches(tournament)
-        decklists = download_all_decklists(deck_ids, max_decks=args.max_decklists)
+        decklists = fetch_decklists_pipeline(
+            tournament,
+            max_decks=args.max_decklists,
+            concurrency=args.concurrency,
+            cache_dir=cache_dir,
+            refresh=args.refresh,
+        )
         export_decklists_csv(decklists, "decklists.csv")
 
     # 4. Analyze metagame
     meta = analyze_metagame(tournament, archetype_map, decklists)
 
+    # Arquetipos con más nombres de deck agrupados (ya calculados en meta; a
+    # igualdad, los de más pilotos primero)
+    lines = [f"\n[*] Arquetipos identificados: {len(meta.archetypes)}"]
+    for arch in heapq.nlargest(20, meta.archetypes.values(), key=lambda a: len(a.deck_names)):
+        lines.append(f"  {arch.name}: {len(arch.deck_names)} deck names")
+    sys.stdout.write("\n".join(lines) + "\n")
+
     # 5. Export
     export_archetype_summary_csv(meta, "archetype_summary.csv")
     generate_html_dashboard(meta, tournament, args.html)
-    export_full_json(meta, tournament, args.json_out)
-
-    # 6. Print summary
-    print(f"\n{'='*60}")
-    print("RESUMEN DEL METAGAME")
-    print(f"{'='*60}")
-    print(f"{'Archetype':<30} {'Share':>6} {'Pilots':>7} {'WR%':>6}")
-    print("-" * 55)
-    for arch in sorted(meta.archetypes.values(), key=lambda a: a.count, reverse=True)[:20]:
+    export_full_json(meta, tournament, args.json_out, pretty=args.pretty)
+
+    # 6. Print summary (en una sola escritura)
+    lines = [
+        f"\n{'='*60}",
+        "RESUMEN DEL METAGAME",
+        f"{'='*60}",
+        f"{'Archetype':<30} {'Share':>6} {'Pilots':>7} {'WR%':>6}",
+        "-" * 55,
+    ]
+    for arch in (meta.archetypes[name] for name in meta.ordered_archetypes[:20]):
         share = meta.meta_share.get(arch.name, 0)
-        print(f"{arch.name:<30} {share:>5.1f}% {arch.count:>6} {arch.winrate:>5.1f}%")
+        lines.append(f"{arch.name:<30} {share:>5.1f}% {arch.count:>6} {arch.winrate:>5.1f}%")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+    # 7. Estadísticas de red
+    if args.profile:
+        stats = scraper.RATE_LIMITER.stats()
+        print(f"\n[profile] Peticiones: {stats['requests']} | Throttled (429/503): {stats['throttled']}")
+        print(f"[profile] Intentos por petición: {stats['attempts']}")
+        print(f"[profile] Tasa efectiva: {stats['rate']:.2f} req/s | Intervalo final: {stats['delay']:.3f}s")
 
 
 if __name__ == "__main__":
@@ -8,6 +8,8 @@ directamente desde el navegador.
 Uso:
     python server.py              # Puerto 8080 por defecto
     python server.py --port 3000  # Puerto personalizado
+    python server.py --regen      # Regenerar dist/ al arrancar
+    DEV_RELOAD=1 python server.py # Recarga generate_site.py en cada regeneración
 
 Endpoints API:
     GET  /api/tournaments          Lista de torneos
@@ -16,34 +18,194 @@ Endpoints API:
 """
 
 import argparse
+import email.utils
+import gzip
+import importlib
+import io
 import json
 import os
+import re
 import sys
 import threading
 import time
-from http.server import HTTPServer, SimpleHTTPRequestHandler
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 
 import manage_tournaments as mt
-import generate_site
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DIST_DIR = os.path.join(BASE_DIR, "dist")
 
+# Ruta de un torneo concreto en la API: solo IDs numéricos
+TID_RE = re.compile(r"^/api/tournaments/([0-9]+)$")
+
+# Serializa las escrituras en la DB y la regeneración de dist/. Las lecturas
+# no lo toman: trabajan sobre la DB cacheada, que solo cambia bajo el lock.
+DB_LOCK = threading.RLock()
+
+REGEN_DEBOUNCE = 0.5  # segundos para agrupar ráfagas de cambios en una regeneración
+
+# Compresión gzip de respuestas
+GZIP_MIN_SIZE = 1024                # no compensa comprimir cuerpos más pequeños
+GZIP_JSON_LEVEL = 1                 # API: se comprime en cada petición, prima la velocidad
+GZIP_STATIC_LEVEL = 6               # estáticos: se comprimen una vez y se cachean
+GZIP_EXTENSIONS = {".html", ".js", ".css", ".json", ".svg", ".txt"}
+
+# Estáticos ya comprimidos: {ruta: (mtime_ns, bytes gzip)}
+_gzip_cache = {}
+_gzip_cache_lock = threading.Lock()
+
+
+def _gzip_file(path: str, mtime_ns: int) -> bytes:
+    """Retorna el contenido de path comprimido, reutilizándolo mientras no cambie."""
+    cached = _gzip_cache.get(path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1]
+    with open(path, "rb") as f:
+        data = gzip.compress(f.read(), compresslevel=GZIP_STATIC_LEVEL)
+    with _gzip_cache_lock:
+        _gzip_cache[path] = (mtime_ns, data)
+    return data
+
+
+class SiteRegenerator:
+    """
+    Regenera dist/ en un thread de fondo.
+
+    request() solo anota la petición y retorna; el worker espera
+    REGEN_DEBOUNCE segundos y hace una única regeneración para todas las
+    peticiones acumuladas. pending indica si queda alguna por atender.
+    """
+
+    def __init__(self, debounce: float = REGEN_DEBOUNCE):
+        self.debounce = debounce
+        self._cond = threading.Condition()
+        self._requested = 0  # peticiones recibidas
+        self._done = 0       # peticiones cubiertas por la última regeneración
+        self._db = None
+        self._thread = None
+
+    @property
+    def pending(self) -> bool:
+        with self._cond:
+            return self._requested != self._done
+
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="site-regen", daemon=True)
+            self._thread.start()
+
+    def request(self, db):
+        with self._cond:
+            self._db = db
+            self._requested += 1
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._requested == self._done:
+                    self._cond.wait()
+            time.sleep(self.debounce)
+            with self._cond:
+                target = self._requested
+                db = self._db
+            regenerate_site(db)
+            with self._cond:
+                self._done = target
+
+
+def regenerate_site(db):
+    """Regenera el sitio estático con todos los torneos actuales."""
+    import generate_site  # solo hace falta al regenerar
+
+    with DB_LOCK:
+        try:
+            # Recarga en caliente de generate_site solo en desarrollo
+            if os.environ.get("DEV_RELOAD"):
+                generate_site = importlib.reload(generate_site)
+            if db.tournaments:
+                generate_site.generate_multi_tournament_site(db.data["tournaments"], DIST_DIR)
+                print("[✓] Sitio regenerado.")
+            else:
+                print("[!] Sin torneos — sitio no regenerado.")
+        except Exception as e:
+            print(f"[!] Error regenerando sitio: {e}")
+
+
+REGENERATOR = SiteRegenerator()
+
 
 class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
     """HTTP handler: sirve archivos estáticos de dist/ + API REST."""
 
+    # DB compartida entre peticiones; se recarga solo si el archivo cambia
+    db = None
+
+    # ETag del estático en curso (lo fija send_head y lo emite end_headers)
+    _etag = None
+
+    # Conexiones persistentes (keep-alive): todas las respuestas llevan
+    # Content-Length. Escritura con buffer para no hacer un send() por línea.
+    protocol_version = "HTTP/1.1"
+    wbufsize = 1 << 16
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, directory=DIST_DIR, **kwargs)
 
     # ── Helpers ──────────────────────────────────────────────
+    def _get_db(self):
+        """Retorna la TournamentDB cacheada, recargándola si cambió en disco."""
+        cls = MetaAnalyzerHandler
+        if cls.db is None:
+            # Primera carga: se espera al lock para que ninguna petición
+            # concurrente vea la DB a None mientras otra la está leyendo
+            with DB_LOCK:
+                if cls.db is None:
+                    cls.db = mt.TournamentDB()
+                    return cls.db
+        # Si hay una escritura en curso, su estado en memoria manda: no se
+        # recarga ni se espera a que termine.
+        if DB_LOCK.acquire(blocking=False):
+            try:
+                cls.db.reload()
+            finally:
+                DB_LOCK.release()
+        return cls.db
+
+    def _accepts_gzip(self) -> bool:
+        """True si Accept-Encoding incluye gzip con q > 0."""
+        for token in self.headers.get("Accept-Encoding", "").split(","):
+            coding, *params = token.split(";")
+            if coding.strip().lower() != "gzip":
+                continue
+            q = 1.0
+            for param in params:
+                name, _, value = param.partition("=")
+                if name.strip().lower() == "q":
+                    try:
+                        q = float(value)
+                    except ValueError:
+                        q = 0.0
+            return q > 0
+        return False
+
     def _send_json(self, data, status=200):
         body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+        compress = len(body) >= GZIP_MIN_SIZE and self._accepts_gzip()
+        if compress:
+            body = gzip.compress(body, compresslevel=GZIP_JSON_LEVEL)
         self.send_response(status)
         self.send_header("Content-Type", "application/json; charset=utf-8")
+        if compress:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Vary", "Accept-Encoding")
         self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")
+        # La API nunca se cachea
+        self.send_header("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0")
+        self.send_header("Pragma", "no-cache")
+        self.send_header("Expires", "0")
         self.end_headers()
         self.wfile.write(body)
 
@@ -52,6 +214,50 @@ class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
         raw = self.rfile.read(length) if length else b"{}"
         return json.loads(raw)
 
+    def send_head(self):
+        """
+        Sirve un estático validando con ETag (304 si el cliente ya lo tiene)
+        y comprimido con gzip si es de texto y el cliente lo acepta.
+        """
+        path = self.translate_path(self.path)
+        if os.path.isdir(path):
+            # Sin barra final: que SimpleHTTPRequestHandler haga la redirección
+            if not urlparse(self.path).path.endswith("/"):
+                return super().send_head()
+            path = os.path.join(path, "index.html")
+        try:
+            st = os.stat(path)
+        except OSError:
+            return super().send_head()  # 404 o listado de directorio
+
+        compress = os.path.splitext(path)[1].lower() in GZIP_EXTENSIONS and self._accepts_gzip()
+        # La versión gzip es otra representación: necesita su propio ETag
+        etag = f'"{st.st_mtime_ns:x}-{st.st_size:x}{"-gz" if compress else ""}"'
+        self._etag = etag
+
+        if_none_match = self.headers.get("If-None-Match")
+        if if_none_match and (if_none_match.strip() == "*" or etag in (t.strip() for t in if_none_match.split(","))):
+            self.send_response(304)
+            self.end_headers()
+            return None
+
+        if not compress:
+            return super().send_head()
+        body = _gzip_file(path, st.st_mtime_ns)
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Last-Modified", email.utils.formatdate(st.st_mtime, usegmt=True))
+        self.end_headers()
+        return io.BytesIO(body)
+
+    def _discard_body(self):
+        """Consume el cuerpo no leído para que no contamine la siguiente petición."""
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+
     # ── CORS preflight ───────────────────────────────────────
     def do_OPTIONS(self):
         self.send_response(204)
@@ -63,7 +269,7 @@ class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
     # ── GET ───────────────────────────────────────────────────
     def do_GET(self):
         if self.path == "/api/tournaments":
-            db = mt.TournamentDB()
+            db = self._get_db()
             self._send_json({
                 "ok": True,
                 "tournaments": db.list_tournaments(),
@@ -72,17 +278,22 @@ class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
             return
 
         if self.path == "/api/status":
-            self._send_json({"ok": True, "status": "running"})
+            self._send_json({"ok": True, "status": "running", "regen_pending": REGENERATOR.pending})
             return
 
-        # Servir archivos estáticos (sin caché)
+        # Servir archivos estáticos (revalidados por ETag, ver send_head)
         super().do_GET()
 
     def end_headers(self):
-        """Añadir headers anti-caché a TODAS las respuestas."""
-        self.send_header("Cache-Control", "no-store, no-cache, must-revalidate, max-age=0")
-        self.send_header("Pragma", "no-cache")
-        self.send_header("Expires", "0")
+        """Cabeceras comunes: validación por ETag de estáticos y keep-alive."""
+        etag, self._etag = self._etag, None  # el handler se reutiliza entre peticiones
+        if etag:
+            # El navegador guarda el estático pero revalida siempre (304 si no cambió)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.send_header("Vary", "Accept-Encoding")
+        if not self.close_connection:
+            self.send_header("Connection", "keep-alive")
         super().end_headers()
 
     # ── POST ──────────────────────────────────────────────────
@@ -104,7 +315,7 @@ class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
                     self._send_json({"ok": False, "error": str(e)}, 400)
                     return
 
-                db = mt.TournamentDB()
+                db = self._get_db()
 
                 # Comprobar si ya existe
                 if db.has_tournament(tid) and not force:
@@ -146,7 +357,7 @@ class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
                     return
 
                 tid = mt.extract_tournament_id(url)
-                db = mt.TournamentDB()
+                db = self._get_db()
 
                 # Comprobar si ya existe
                 if db.has_tournament(tid) and not force:
@@ -164,13 +375,14 @@ class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
                     self._regenerate_site(db)
                     return
 
-                # Scrapear (puede tardar)
-                tdata = db.add_tournament(url, force=force)
+                # Scrapear (puede tardar) sin DB_LOCK: solo la inserción, el
+                # guardado y la regeneración del sitio van bajo el lock
+                tdata = db.scrape_tournament_data(tid)
+                with DB_LOCK:
+                    db.insert_tournament(tid, tdata)
+                    self._regenerate_site(db)
                 info = tdata["tournament"]
 
-                # Regenerar sitio
-                self._regenerate_site(db)
-
                 self._send_json({
                     "ok": True,
                     "action": "added",
@@ -188,18 +400,24 @@ class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
                 self._send_json({"ok": False, "error": str(e)}, 500)
             return
 
+        self._discard_body()
         self._send_json({"ok": False, "error": "Endpoint no encontrado"}, 404)
 
     # ── DELETE ────────────────────────────────────────────────
     def do_DELETE(self):
+        self._discard_body()
         # /api/tournaments/339227
-        if self.path.startswith("/api/tournaments/"):
-            tid = self.path.split("/")[-1]
-            db = mt.TournamentDB()
-            if db.has_tournament(tid):
-                name = db.get_tournament(tid)["tournament"]["name"]
-                db.remove_tournament(tid)
-                self._regenerate_site(db)
+        m = TID_RE.match(self.path)
+        if m:
+            tid = m.group(1)
+            db = self._get_db()
+            with DB_LOCK:
+                name = None
+                if db.has_tournament(tid):
+                    name = db.get_tournament(tid)["tournament"]["name"]
+                    db.remove_tournament(tid)
+                    self._regenerate_site(db)
+            if name is not None:
                 self._send_json({
                     "ok": True,
                     "action": "removed",
@@ -215,17 +433,8 @@ class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
 
     # ── Regenerar sitio ──────────────────────────────────────
     def _regenerate_site(self, db):
-        """Regenera el sitio estático con todos los torneos actuales."""
-        try:
-            import importlib
-            importlib.reload(generate_site)
-            if db.tournaments:
-                generate_site.generate_multi_tournament_site(db.data["tournaments"], DIST_DIR)
-                print("[✓] Sitio regenerado.")
-            else:
-                print("[!] Sin torneos — sitio no regenerado.")
-        except Exception as e:
-            print(f"[!] Error regenerando sitio: {e}")
+        """Encola la regeneración del sitio (ver SiteRegenerator)."""
+        REGENERATOR.request(db)
 
     # ── Log todas las requests ─────────────────────────────
     def log_message(self, format, *args):
@@ -233,20 +442,28 @@ class MetaAnalyzerHandler(SimpleHTTPRequestHandler):
         super().log_message(format, *args)
 
 
-def run_server(port=8080):
-    """Arranca el servidor HTTP."""
-    # Asegurar que dist/ existe
-    if not os.path.exists(DIST_DIR):
-        print("[*] dist/ no existe, generando sitio...")
-        db = mt.TournamentDB()
+def run_server(port=8080, regen=False):
+    """
+    Arranca el servidor HTTP.
+
+    Si dist/index.html ya existe se sirve tal cual (la DB se carga con la
+    primera petición a la API); regen=True fuerza regenerar el sitio.
+    """
+    if regen or not os.path.exists(os.path.join(DIST_DIR, "index.html")):
+        print("[*] Generando sitio..." if regen else "[*] dist/index.html no existe, generando sitio...")
+        db = MetaAnalyzerHandler.db = mt.TournamentDB()
         if db.tournaments:
+            import generate_site
             generate_site.generate_multi_tournament_site(db.data["tournaments"], DIST_DIR)
         else:
             os.makedirs(DIST_DIR, exist_ok=True)
             with open(os.path.join(DIST_DIR, "index.html"), "w") as f:
                 f.write("<html><body><h1>No hay torneos. Usa la API para añadir uno.</h1></body></html>")
 
-    server = HTTPServer(("0.0.0.0", port), MetaAnalyzerHandler)
+    # Un thread por petición: un scrape largo en add-sync no bloquea el
+    # resto de peticiones (estáticos, /api/status, ...)
+    REGENERATOR.start()
+    server = ThreadingHTTPServer(("0.0.0.0", port), MetaAnalyzerHandler)
     print(f"")
     print(f"  🎴  MTG Meta Analyzer Server")
     print(f"  ════════════════════════════════════")
@@ -271,5 +488,6 @@ def run_server(port=8080):
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="MTG Meta Analyzer Server")
     parser.add_argument("--port", "-p", type=int, default=8080, help="Puerto (default: 8080)")
+    parser.add_argument("--regen", action="store_true", help="Regenerar dist/ al arrancar aunque ya exista")
     args = parser.parse_args()
-    run_server(args.port)
+    run_server(args.port, regen=args.regen)